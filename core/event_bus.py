@@ -5,7 +5,9 @@ Replaces event-bus.sh with better error handling and validation.
 """
 
 import json
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator, Optional
@@ -19,13 +21,24 @@ class EventBus:
     Supports both JSONL file-based events and SQLite storage.
     """
     
-    def __init__(self, events_dir: Optional[Path] = None, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        events_dir: Optional[Path] = None,
+        db_path: Optional[Path] = None,
+        coalesce: bool = False,
+        batch_size: int = 64,
+        flush_interval: float = 0.05
+    ):
         """
         Initialize event bus.
         
         Args:
             events_dir: Directory for JSONL event files (default: ~/.liku/state/events)
             db_path: Path to SQLite database (default: ~/.liku/db/liku.db)
+            coalesce: Queue database writes and flush them in batches from a
+                background thread instead of committing once per event
+            batch_size: Number of queued events that triggers an early flush
+            flush_interval: Maximum seconds an event waits in the queue
         """
         home = Path.home()
         self.events_dir = Path(events_dir) if events_dir else home / ".liku" / "state" / "events"
@@ -39,6 +52,23 @@ class EventBus:
                 self.db = StateBackend(str(db_file))
             except Exception as e:
                 print(f"Warning: Could not connect to state backend: {e}")
+        
+        # Write-coalescing queue for database rows (only with a backend)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._max_pending = batch_size * 16
+        self._event_queue: deque = deque()
+        self._event_cv = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        if coalesce and self.db:
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="liku-event-writer",
+                daemon=True
+            )
+            self._writer.start()
     
     def emit(
         self,
@@ -91,7 +121,18 @@ class EventBus:
             f.flush()  # Ensure data is written immediately
         
         # Also store in SQLite if available
-        if self.db:
+        queued = False
+        if self._writer:
+            with self._event_cv:
+                # Backpressure: never let the queue grow without bound
+                self._event_cv.wait_for(lambda: len(self._event_queue) < self._max_pending or self._closed)
+                # Once closed nothing drains the queue; write synchronously below
+                if not self._closed:
+                    self._event_queue.append((event_type, event["payload"], session_key, agent_name))
+                    queued = True
+                    if len(self._event_queue) >= self.batch_size:
+                        self._event_cv.notify_all()
+        if not queued and self.db:
             try:
                 self.db.log_event(
                     event_type=event_type,
@@ -104,6 +145,56 @@ class EventBus:
         
         return str(event_file)
     
+    def _writer_loop(self):
+        """Background thread draining queued events into the database."""
+        while True:
+            with self._event_cv:
+                self._event_cv.wait_for(lambda: self._event_queue or self._closed)
+                # Give the batch a chance to fill before committing
+                self._event_cv.wait_for(
+                    lambda: len(self._event_queue) >= self.batch_size or self._closed,
+                    timeout=self.flush_interval
+                )
+                closed = self._closed
+            
+            self.flush()
+            if closed:
+                return
+    
+    def _write_batch(self, batch: list):
+        """Write a batch of queued events in one transaction."""
+        if not batch:
+            return
+        try:
+            self.db.log_events(batch)
+        except Exception as e:
+            print(f"Warning: Could not log {len(batch)} events to database: {e}")
+    
+    def flush(self):
+        """Synchronously write any queued events to the database."""
+        if not self._writer:
+            return
+        # Serialize with the writer thread so a returned flush() means every
+        # event queued before it is committed
+        with self._write_lock:
+            with self._event_cv:
+                batch = list(self._event_queue)
+                self._event_queue.clear()
+                self._event_cv.notify_all()
+            self._write_batch(batch)
+    
+    def close(self):
+        """Flush queued events and stop the background writer."""
+        if not self._writer:
+            return
+        with self._event_cv:
+            self._closed = True
+            self._event_cv.notify_all()
+        self._writer.join(timeout=5)
+        # Write whatever the writer did not get to, then emit() goes synchronous
+        self.flush()
+        self._writer = None
+    
     def stream(self, follow: bool = True) -> Iterator[Dict[str, Any]]:
         """
         Stream events from the bus.
@@ -208,6 +299,8 @@ class EventBus:
                     continue
             return events
         
+        # Make queued writes visible to the reader
+        self.flush()
         return self.db.get_events(event_type=event_type, limit=limit)
 
 
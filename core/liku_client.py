@@ -4,16 +4,76 @@ Python client library for communicating with the LIKU daemon.
 Provides high-level API for LIKU operations via UNIX socket or TCP.
 """
 
+import errno
 import json
+import os
 import socket
+import struct
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Platform detection for socket type
 SUPPORTS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+SOCK_SEQPACKET = getattr(socket, "SOCK_SEQPACKET", None)
 DEFAULT_TCP_PORT = 13337
 
+# Wire framing: every message is a 4-byte big-endian length plus the payload;
+# responses add a 1-byte kind so raw bodies can skip JSON on both ends
+FRAME_HEADER = struct.Struct(">I")
+RESPONSE_HEADER = struct.Struct(">IB")
+KIND_JSON = 0x00
+KIND_RAW = 0x01
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    """Read exactly size bytes into a single preallocated buffer."""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if not n:
+            raise ConnectionError("Daemon closed the connection without a response.")
+        received += n
+    return buf
+
+
+def _supports_seqpacket() -> bool:
+    """Check whether AF_UNIX sockets accept SOCK_SEQPACKET (not on macOS)."""
+    if not SUPPORTS_UNIX_SOCKETS or SOCK_SEQPACKET is None:
+        return False
+    try:
+        socket.socket(socket.AF_UNIX, SOCK_SEQPACKET).close()
+    except OSError:
+        return False
+    return True
+
+
+def _send_frame(sock: socket.socket, payload: bytes):
+    """Send a request payload prefixed with its length."""
+    if sock.type == SOCK_SEQPACKET:
+        # The kernel keeps record boundaries; no prefix needed
+        sock.sendall(payload)
+    else:
+        sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_frame(sock: socket.socket) -> Tuple[int, bytearray]:
+    """Read one response frame and return its kind and payload."""
+    if sock.type == SOCK_SEQPACKET:
+        # Peek the full message size so the buffer can be allocated exactly
+        size = sock.recv_into(bytearray(1), 1, socket.MSG_PEEK | socket.MSG_TRUNC)
+        if not size:
+            raise ConnectionError("Daemon closed the connection without a response.")
+        buf = bytearray(size)
+        sock.recv_into(buf, size)
+        kind = buf[0]
+        del buf[:1]
+        return kind, buf
+    length, kind = RESPONSE_HEADER.unpack(_recv_exact(sock, RESPONSE_HEADER.size))
+    return kind, _recv_exact(sock, length)
+
 
 class LikuClient:
     """Client for interacting with the LIKU daemon."""
@@ -35,6 +95,13 @@ class LikuClient:
             timeout: Socket timeout in seconds
         """
         self.timeout = timeout
+        # UNIX socket type; matches a daemon started with LIKU_SEQPACKET=1,
+        # and switches automatically if the daemon uses the other type
+        self._unix_type = (
+            SOCK_SEQPACKET
+            if os.getenv("LIKU_SEQPACKET") == "1" and _supports_seqpacket()
+            else socket.SOCK_STREAM
+        )
         
         # Determine connection mode
         if tcp_host and tcp_port:
@@ -66,9 +133,25 @@ class LikuClient:
         else:
             if not self.socket_path or not Path(self.socket_path).exists():
                 raise ConnectionError(f"UNIX socket not found at {self.socket_path}")
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock = self._connect_unix()
+            except OSError as e:
+                if e.errno != errno.EPROTOTYPE or SOCK_SEQPACKET is None:
+                    raise
+                # The daemon listens with the other socket type; remember it
+                self._unix_type = socket.SOCK_STREAM if self._unix_type == SOCK_SEQPACKET else SOCK_SEQPACKET
+                sock = self._connect_unix()
+        return sock
+
+    def _connect_unix(self) -> socket.socket:
+        """Connect to the UNIX socket with the current socket type."""
+        sock = socket.socket(socket.AF_UNIX, self._unix_type)
+        try:
             sock.settimeout(self.timeout)
             sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
         return sock
 
     def _send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,14 +166,11 @@ class LikuClient:
         """
         try:
             with self._get_socket() as sock:
-                sock.sendall(json.dumps(request).encode())
+                _send_frame(sock, json.dumps(request).encode())
                 
                 # Receive response
-                response_data = sock.recv(8192)
-                if not response_data:
-                    raise ConnectionError("Daemon closed the connection without a response.")
-                
-                response = json.loads(response_data.decode())
+                _, payload = _recv_frame(sock)
+                response = json.loads(payload)
                 
                 if response.get("status") == "error":
                     raise RuntimeError(f"Daemon error: {response.get('error', 'Unknown error')}")
@@ -266,6 +346,37 @@ class LikuClient:
         
         return response["output"]
     
+    def capture_pane_raw(self, pane_id: str, start: int = -50) -> bytes:
+        """
+        Capture pane output as raw bytes, skipping JSON encoding of the body.
+        
+        Args:
+            pane_id: Pane ID to capture
+            start: Starting line number
+            
+        Returns:
+            Captured output bytes, as produced by the sandbox
+        """
+        request = {"action": "capture_pane_raw", "pane_id": pane_id, "start": start}
+        try:
+            with self._get_socket() as sock:
+                _send_frame(sock, json.dumps(request).encode())
+                
+                # A raw frame on success, a JSON frame on error
+                kind, payload = _recv_frame(sock)
+        except (ConnectionRefusedError, FileNotFoundError):
+            endpoint = f"{self.tcp_host}:{self.tcp_port}" if self.use_tcp else self.socket_path
+            raise ConnectionError(f"Could not connect to LIKU daemon at {endpoint}. Is it running?")
+        
+        if kind == KIND_RAW:
+            return bytes(payload)
+        
+        try:
+            response = json.loads(payload)
+        except json.JSONDecodeError:
+            raise ValueError("Failed to decode JSON response from daemon.")
+        raise RuntimeError(f"Daemon error: {response.get('error', 'Unknown error')}")
+    
     # State operations
     
     def get_agent_sessions(self) -> List[Dict[str, Any]]:
@@ -6,22 +6,184 @@ Exposes UNIX socket API for CLI clients and optional HTTP REST API.
 """
 
 import json
+import logging
 import os
+import queue
+import selectors
+import signal
 import socket
+import struct
 import sys
 import threading
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from liku.event_bus import EventBus
 from liku.state_backend import StateBackend
+from liku.sandbox.base import Sandbox
 from liku.sandbox.factory import SandboxFactory
 from liku.sandbox.tmux_backend import TmuxSandbox
 
+logger = logging.getLogger(__name__)
+
+# Wire codec, chosen once at import: orjson parses bytes and returns bytes
+# directly, skipping the str decode/encode round trip.
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Wire framing: every message is a 4-byte big-endian length plus the payload;
+# responses add a 1-byte kind so raw bodies can skip JSON on both ends
+FRAME_HEADER = struct.Struct(">I")
+RESPONSE_HEADER = struct.Struct(">IB")
+KIND_JSON = 0x00
+KIND_RAW = 0x01
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# How long tmux listings are reused before shelling out again
+LIST_CACHE_TTL = 0.2
+
+# Selector key data marking the wakeup socket
+_WAKEUP = "wakeup"
+
 # Platform detection for socket type
 SUPPORTS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+SOCK_SEQPACKET = getattr(socket, "SOCK_SEQPACKET", None)
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")  # Not on Windows
+HAS_PEERCRED = hasattr(socket, "SO_PEERCRED")  # Linux only
+PEERCRED = struct.Struct("3i")  # struct ucred: pid, uid, gid
+# Largest request read in one recv, and the socket buffer requested, in
+# SOCK_SEQPACKET mode (the send buffer also caps the largest response)
+SEQPACKET_BUFFER = 1 << 20
 DEFAULT_TCP_PORT = 13337
+# Workers mostly wait on sqlite and tmux subprocesses, so oversubscribe the CPUs
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Default locations, resolved once at import
+_MODULE_DIR = Path(__file__).resolve().parent
+_DEFAULT_CONFIG = _MODULE_DIR.parent / "config" / "agents.yaml"
+_DEFAULT_AGENTS_DIR = _MODULE_DIR.parent / "agents"
+_LIKU_HOME = Path.home() / ".liku"
+BUSY_POLL_USEC = 50
+
+
+def _resolve_use_tcp(use_tcp: Optional[bool] = None) -> bool:
+    """Resolve the transport from an explicit flag or the LIKU_USE_TCP env var."""
+    if use_tcp is not None:
+        return use_tcp
+    use_tcp_env = os.getenv("LIKU_USE_TCP", "auto")
+    return not SUPPORTS_UNIX_SOCKETS if use_tcp_env == "auto" else use_tcp_env == "1"
+
+
+def _supports_seqpacket() -> bool:
+    """Check whether AF_UNIX sockets accept SOCK_SEQPACKET (not on macOS)."""
+    if not SUPPORTS_UNIX_SOCKETS or SOCK_SEQPACKET is None:
+        return False
+    try:
+        socket.socket(socket.AF_UNIX, SOCK_SEQPACKET).close()
+    except OSError:
+        return False
+    return True
+
+
+def _send_frame(sock: socket.socket, payload: bytes, kind: int = KIND_JSON):
+    """
+    Send a response payload prefixed with its length and kind.
+    
+    Header and payload go out in one vectored write (writev) where the
+    platform has sendmsg, so the payload is never copied into a combined
+    buffer. A short write is finished with sendall.
+    
+    Args:
+        sock: Connected client socket, in blocking mode
+        payload: Encoded response body
+        kind: KIND_JSON or KIND_RAW
+    """
+    if sock.type == SOCK_SEQPACKET:
+        # The kernel keeps record boundaries; only the kind byte is needed
+        header = bytes((kind,))
+    else:
+        header = RESPONSE_HEADER.pack(len(payload), kind)
+    
+    if not HAS_SENDMSG:
+        sock.sendall(header + payload)
+        return
+    
+    sent = sock.sendmsg([header, payload])
+    if sent < len(header):
+        sock.sendall(header[sent:])
+        sock.sendall(payload)
+    elif sent < len(header) + len(payload):
+        sock.sendall(memoryview(payload)[sent - len(header):])
+
+
+class _PendingRequest:
+    """Read state of a client connection while its request frame arrives."""
+    
+    __slots__ = ("sock", "buf", "view", "received", "length")
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.length: Optional[int] = None
+        self.expect(FRAME_HEADER.size)
+    
+    def expect(self, size: int):
+        """Preallocate the buffer for the next part of the frame."""
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.received = 0
+
+
+class _Encoded(dict):
+    """Response dict that carries its wire encoding, computed once."""
+    
+    __slots__ = ("encoded",)
+    
+    def __init__(self, encoded: Optional[bytes] = None, **fields: Any):
+        super().__init__(**fields)
+        self.encoded = _dumps(self) if encoded is None else encoded
+
+
+# Error responses differ only in their message, so they are encoded from a
+# template around the JSON-escaped message instead of walking a dict
+_ERR_PREFIX = b'{"status":"error","error":'
+_ERR_SUFFIX = b'}'
+
+
+def _error(message: str) -> _Encoded:
+    """Build an error response with its encoding."""
+    return _Encoded(_ERR_PREFIX + _dumps(message) + _ERR_SUFFIX, status="error", error=message)
+
+
+# Constant responses, encoded at import and sent verbatim
+_OK = _Encoded(status="ok")
+_PONG = _Encoded(status="ok", message="pong")
+_ERR_MISSING_ACTION = _error("Missing 'action' field")
+_ERR_MISSING_EVENT_TYPE = _error("Missing 'event_type'")
+_ERR_MISSING_PANE_ID = _error("Missing 'pane_id'")
+_ERR_MISSING_PANE_OR_KEYS = _error("Missing 'pane_id' or 'keys'")
+_ERR_MISSING_AGENT_OR_SESSION = _error("Missing 'agent_name' or 'session'")
+_ERR_MISSING_AGENT_NAME = _error("Missing 'agent_name'")
+_ERR_MISSING_SESSION_KEY = _error("Missing 'session_key'")
+
+
+class RawResponse(NamedTuple):
+    """Response sent unescaped as a single KIND_RAW frame."""
+    body: bytes
 
 
 class LikuDaemon:
@@ -37,7 +199,8 @@ class LikuDaemon:
         db_path: Optional[str] = None,
         events_dir: Optional[str] = None,
         config_path: Optional[str] = None,
-        use_tcp: bool = None
+        use_tcp: Optional[bool] = None,
+        worker_index: int = 0
     ):
         """
         Initialize the LIKU daemon.
@@ -52,32 +215,35 @@ class LikuDaemon:
             events_dir: Directory for event files (overrides env var)
             config_path: Path to agents.yaml config file (overrides env var)
             use_tcp: Force TCP mode even on Unix platforms (overrides env var)
+            worker_index: Index of this process when running LIKU_PROCESSES > 1
         """
-        home = Path.home()
-
         # Determine communication mode from env or args
-        if use_tcp is None:
-            use_tcp_env = os.getenv("LIKU_USE_TCP", "auto")
-            self.use_tcp = not SUPPORTS_UNIX_SOCKETS if use_tcp_env == "auto" else use_tcp_env == "1"
-        else:
-            self.use_tcp = use_tcp
+        self.use_tcp = _resolve_use_tcp(use_tcp)
+
+        # Multi-process scale-out (TCP only, see _configure_scale_out)
+        self.processes = int(os.getenv("LIKU_PROCESSES", 1))
+        self.worker_index = worker_index
 
         # Setup communication endpoint
         if self.use_tcp:
             self.tcp_port = tcp_port or int(os.getenv("LIKU_TCP_PORT", DEFAULT_TCP_PORT))
             self.tcp_host = "127.0.0.1"
             self.socket_path = None
+            self.seqpacket = False
             endpoint = f"TCP {self.tcp_host}:{self.tcp_port}"
         else:
-            self.socket_path = socket_path or os.getenv("LIKU_SOCKET_PATH") or str(home / ".liku" / "liku.sock")
+            self.socket_path = socket_path or os.getenv("LIKU_SOCKET_PATH") or str(_LIKU_HOME / "liku.sock")
             self.tcp_port = None
             self.tcp_host = None
-            endpoint = f"UNIX {self.socket_path}"
+            # Opt-in: message-preserving sockets need no length prefix, but
+            # responses are capped by the socket send buffer
+            self.seqpacket = os.getenv("LIKU_SEQPACKET") == "1" and _supports_seqpacket()
+            endpoint = f"UNIX {self.socket_path}{' (seqpacket)' if self.seqpacket else ''}"
 
         # Setup paths from env or args
-        self.db_path = db_path or os.getenv("LIKU_DB_PATH") or str(home / ".liku" / "db" / "liku.db")
-        self.events_dir = events_dir or os.getenv("LIKU_EVENTS_DIR") or str(home / ".liku" / "state" / "events")
-        self.config_path = config_path or os.getenv("LIKU_CONFIG_PATH") or str(Path(__file__).parent.parent / "config" / "agents.yaml")
+        self.db_path = db_path or os.getenv("LIKU_DB_PATH") or str(_LIKU_HOME / "db" / "liku.db")
+        self.events_dir = events_dir or os.getenv("LIKU_EVENTS_DIR") or str(_LIKU_HOME / "state" / "events")
+        self.config_path = config_path or os.getenv("LIKU_CONFIG_PATH") or str(_DEFAULT_CONFIG)
 
         # Ensure directories exist
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -88,17 +254,44 @@ class LikuDaemon:
 
         # Initialize components
         self.state_backend = StateBackend(self.db_path)
-        self.event_bus = EventBus(events_dir=self.events_dir, db_path=self.db_path)
+        self.event_bus = EventBus(events_dir=self.events_dir, db_path=self.db_path, coalesce=True)
         
         # Server state
         self.running = False
         self.socket_server: Optional[socket.socket] = None
+        self._selector = selectors.DefaultSelector()
+        self._serving = False
+
+        # Self-pipe: stop() writes a byte so a blocked select() returns at
+        # once (a socketpair rather than os.pipe so Windows can select on it)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, _WAKEUP)
+
+        # Short-lived tmux listings for polling clients, keyed by (action, session)
+        self._list_cache: Dict[Tuple[str, Optional[str]], Tuple[float, _Encoded]] = {}
+        self._list_cache_lock = threading.Lock()
+
+        # One tmux sandbox, created on first use, serves the listings and
+        # lends its tmux manager to the factory's tmux sandbox
+        self._tmux_sandbox: Optional[TmuxSandbox] = None
+        self._tmux_lock = threading.Lock()
+
+        # Bounded worker pool for client connections (reused across requests);
+        # each worker opens its SQLite connection once, up front, and keeps it
+        self.max_workers = int(os.getenv("LIKU_WORKERS", DEFAULT_WORKERS))
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="liku-rpc",
+            initializer=self.state_backend.warm_connection
+        )
         
-        print(f"LIKU Daemon initialized")
-        print(f"  Endpoint: {endpoint}")
-        print(f"  Database: {self.db_path}")
-        print(f"  Events: {self.events_dir}")
-        print(f"  Config: {self.config_path}")
+        logger.info("LIKU Daemon initialized")
+        logger.info("  Endpoint: %s", endpoint)
+        logger.info("  Database: %s", self.db_path)
+        logger.info("  Events: %s", self.events_dir)
+        logger.info("  Config: %s", self.config_path)
 
     def _load_agent_configs(self):
         """Load agent configurations and security policies from YAML file."""
@@ -115,12 +308,12 @@ class LikuDaemon:
                 if "name" in agent_config:
                     self.agent_configs[agent_config["name"]] = agent_config
 
-            print(f"Loaded {len(self.agent_configs)} agent configs and global policies.")
+            logger.info("Loaded %d agent configs and global policies.", len(self.agent_configs))
 
         except FileNotFoundError:
-            print(f"Warning: Config file not found at {self.config_path}. No policies will be applied.")
+            logger.warning("Config file not found at %s. No policies will be applied.", self.config_path)
         except (yaml.YAMLError, Exception) as e:
-            print(f"Warning: Error parsing config file {self.config_path}: {e}. No policies will be applied.")
+            logger.warning("Error parsing config file %s: %s. No policies will be applied.", self.config_path, e)
 
     def _is_command_allowed(self, agent_name: Optional[str], command: str) -> bool:
         """Check if a command is allowed by the security policies."""
@@ -130,7 +323,7 @@ class LikuDaemon:
         # 1. Check against global blacklist
         blocked_commands = self.global_policies.get("blocked_commands", [])
         if any(command.strip().startswith(blocked) for blocked in blocked_commands):
-            print(f"Security: Denied globally blocked command for agent '{agent_name}': {command}")
+            logger.warning("Security: Denied globally blocked command for agent %r: %s", agent_name, command)
             return False
 
         # If there's no agent context, only global blacklist applies
@@ -149,68 +342,288 @@ class LikuDaemon:
         if allowed_commands:
             command_base = command.strip().split()[0]
             if command_base not in allowed_commands:
-                print(f"Security: Denied command for agent '{agent_name}' not in whitelist: {command}")
+                logger.warning("Security: Denied command for agent %r not in whitelist: %s", agent_name, command)
                 return False
         
         return True
 
+    def _create_listener(self, family: int, kind: int = socket.SOCK_STREAM) -> socket.socket:
+        """
+        Create the listening socket.
+        
+        Where supported, close-on-exec is requested atomically through the
+        socket type flags instead of a follow-up fcntl call. CPython accepts
+        with accept4(SOCK_CLOEXEC), so accepted client sockets need no extra
+        syscalls either; the reactor switches them to non-blocking mode itself.
+        
+        Args:
+            family: Address family (AF_INET or AF_UNIX)
+            kind: Socket type (SOCK_STREAM, or SOCK_SEQPACKET for AF_UNIX)
+            
+        Returns:
+            Unbound socket
+        """
+        sock_type = kind | getattr(socket, "SOCK_CLOEXEC", 0)
+        return socket.socket(family, sock_type)
+
+    def _configure_scale_out(self, sock: socket.socket):
+        """
+        Prepare a TCP listener to share its port with sibling daemon processes.
+        
+        SO_REUSEPORT lets the kernel hash incoming connections across every
+        process bound to the port. Each worker also advertises a preferred CPU
+        (SO_INCOMING_CPU, round-robin over the allowed CPUs) so connections are
+        handled on the core that received them, and enables busy polling to
+        trim softirq wakeup latency. The latter two are best-effort.
+        
+        Args:
+            sock: Unbound TCP listener
+        """
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        
+        if hasattr(socket, "SO_INCOMING_CPU") and hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+            cpu = cpus[self.worker_index % len(cpus)]
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_INCOMING_CPU, cpu)
+            except OSError:
+                pass
+        
+        # Only where Python exports the constant: its value differs between
+        # Linux architectures, so a hard-coded fallback could set another option
+        if hasattr(socket, "SO_BUSY_POLL"):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BUSY_POLL, BUSY_POLL_USEC)
+            except OSError:
+                # Raising SO_BUSY_POLL may require CAP_NET_ADMIN
+                pass
+
     def start(self):
         """Start the daemon server."""
         if self.use_tcp:
             # TCP socket for cross-platform support
-            self.socket_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket_server = self._create_listener(socket.AF_INET)
             self.socket_server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.processes > 1:
+                self._configure_scale_out(self.socket_server)
             self.socket_server.bind((self.tcp_host, self.tcp_port))
-            self.socket_server.listen(5)
+            self.socket_server.listen(socket.SOMAXCONN)
             
             self.running = True
-            print(f"LIKU Daemon listening on {self.tcp_host}:{self.tcp_port}")
+            logger.info("LIKU Daemon listening on %s:%s", self.tcp_host, self.tcp_port)
         else:
             # UNIX socket for Unix/Linux/macOS
             if os.path.exists(self.socket_path):
                 os.unlink(self.socket_path)
             
-            self.socket_server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self.socket_server.bind(self.socket_path)
-            self.socket_server.listen(5)
-            
-            # Set socket permissions
-            os.chmod(self.socket_path, 0o600)
+            self.socket_server = self._create_listener(
+                socket.AF_UNIX, SOCK_SEQPACKET if self.seqpacket else socket.SOCK_STREAM
+            )
+            # Create the socket file as 0600 atomically; a chmod after bind
+            # would leave a window where other local users could connect
+            old_umask = os.umask(0o177)
+            try:
+                self.socket_server.bind(self.socket_path)
+            finally:
+                os.umask(old_umask)
+            self.socket_server.listen(socket.SOMAXCONN)
             
             self.running = True
-            print(f"LIKU Daemon listening on {self.socket_path}")
+            logger.info("LIKU Daemon listening on %s", self.socket_path)
         
-        # Accept connections
-        while self.running:
+        # Single-threaded reactor: accept and read requests without blocking,
+        # then hand complete requests to the worker pool
+        self.socket_server.setblocking(False)
+        self._selector.register(self.socket_server, selectors.EVENT_READ)
+        
+        self._serving = True
+        try:
+            while self.running:
+                try:
+                    self._run_once()
+                except KeyboardInterrupt:
+                    logger.info("Shutting down daemon...")
+                    break
+                except Exception as e:
+                    if self.running:  # Only log if not intentionally stopping
+                        logger.error("Error in event loop: %s", e)
+        finally:
+            self.running = False
+            self._serving = False
+            self._shutdown()
+    
+    def _run_once(self, timeout: Optional[float] = None):
+        """
+        Run one iteration of the reactor.
+        
+        Args:
+            timeout: Maximum seconds to wait for socket readiness
+        """
+        for key, _ in self._selector.select(timeout):
+            if key.data is None:
+                self._accept_clients()
+            elif key.data is _WAKEUP:
+                self._drain_wakeup()
+            else:
+                self._read_request(key.data)
+    
+    def _wake(self):
+        """Interrupt a blocked select() from another thread."""
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # Buffer full means a wakeup is already pending
+            pass
+    
+    def _drain_wakeup(self):
+        """Consume pending wakeup bytes."""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+    
+    def _accept_clients(self):
+        """Accept every pending connection and watch it for its request."""
+        while True:
             try:
                 client_socket, _ = self.socket_server.accept()
-                
-                # Handle client in separate thread
-                thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket,),
-                    daemon=True
-                )
-                thread.start()
+            except (BlockingIOError, InterruptedError):
+                return
+            if self.socket_path and not self._peer_allowed(client_socket):
+                client_socket.close()
+                continue
+            client_socket.setblocking(False)
+            if self.seqpacket:
+                try:
+                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEQPACKET_BUFFER)
+                except OSError:
+                    pass
+            self._selector.register(client_socket, selectors.EVENT_READ, _PendingRequest(client_socket))
+    
+    def _peer_allowed(self, client_socket: socket.socket) -> bool:
+        """
+        Check that a UNIX socket peer runs as the daemon's user.
+        
+        Defense in depth next to the 0600 socket file; a no-op where
+        SO_PEERCRED is unavailable (it is Linux-specific).
+        
+        Args:
+            client_socket: Accepted UNIX socket connection
             
-            except KeyboardInterrupt:
-                print("\nShutting down daemon...")
-                break
-            except Exception as e:
-                if self.running:  # Only print if not intentionally stopping
-                    print(f"Error accepting connection: {e}")
+        Returns:
+            False if the peer belongs to another user
+        """
+        if not HAS_PEERCRED:
+            return True
+        creds = client_socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, PEERCRED.size)
+        pid, uid, gid = PEERCRED.unpack(creds)
+        if uid != os.getuid():
+            logger.warning("Rejected connection from pid %d with uid %d", pid, uid)
+            return False
+        return True
+    
+    def _read_request(self, pending: _PendingRequest):
+        """
+        Read whatever part of a request frame is available.
+        
+        Once the frame is complete the socket leaves the reactor and is
+        handed, in blocking mode, to a pool worker for processing.
+        
+        Args:
+            pending: Read state of the client connection
+        """
+        sock = pending.sock
+        if self.seqpacket:
+            self._read_message(sock)
+            return
+        
+        try:
+            n = sock.recv_into(pending.view[pending.received:])
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            n = 0
+        
+        if not n:
+            self._selector.unregister(sock)
+            sock.close()
+            return
+        
+        pending.received += n
+        if pending.received < len(pending.buf):
+            return
+        
+        if pending.length is None:
+            (pending.length,) = FRAME_HEADER.unpack(pending.buf)
+            if pending.length > MAX_FRAME_SIZE:
+                self._dispatch(sock, self._send_error, f"Request too large: {pending.length} bytes")
+            elif pending.length:
+                pending.expect(pending.length)
+            else:
+                self._dispatch(sock, self._handle_client, b"")
+            return
         
-        self.stop()
+        self._dispatch(sock, self._handle_client, pending.buf)
+    
+    def _read_message(self, sock: socket.socket):
+        """
+        Read a whole request from a SOCK_SEQPACKET connection.
+        
+        The kernel preserves record boundaries, so one recv returns exactly
+        one request and no length prefix is needed.
+        
+        Args:
+            sock: Client connection
+        """
+        try:
+            data = sock.recv(SEQPACKET_BUFFER)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        
+        if not data:
+            self._selector.unregister(sock)
+            sock.close()
+            return
+        
+        self._dispatch(sock, self._handle_client, data)
+    
+    def _dispatch(self, sock: socket.socket, fn: Callable[[socket.socket, Any], None], arg: Any):
+        """Remove a socket from the reactor and finish it on a worker thread."""
+        self._selector.unregister(sock)
+        sock.setblocking(True)
+        self._pool.submit(fn, sock, arg)
     
     def stop(self):
-        """Stop the daemon server."""
-        self.running = False
+        """
+        Stop the daemon server.
         
+        While start() is serving, this only wakes the reactor, which leaves
+        its loop and releases resources on its own thread; otherwise the
+        resources are released here.
+        """
+        self.running = False
+        if self._serving:
+            self._wake()
+            return
+        self._shutdown()
+    
+    def _shutdown(self):
+        """Close the listener, worker pool, selector and event bus."""
         if self.socket_server:
             try:
                 self.socket_server.close()
             except Exception:
                 pass
+
+        # Drop queued requests; their sockets close when the futures are freed
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        self.event_bus.close()
         
         if self.socket_path and os.path.exists(self.socket_path):
             try:
@@ -218,41 +631,49 @@ class LikuDaemon:
             except Exception:
                 pass
         
-        print("LIKU Daemon stopped")
+        logger.info("LIKU Daemon stopped")
     
-    def _handle_client(self, client_socket: socket.socket):
+    def _handle_client(self, client_socket: socket.socket, data: Union[bytes, bytearray]):
         """
-        Handle a client connection.
+        Process a request and send the response (runs on a pool worker).
         
         Args:
-            client_socket: Connected client socket
+            client_socket: Connected client socket, in blocking mode
+            data: Complete request payload
         """
         try:
-            # Receive request
-            data = client_socket.recv(4096)
-            if not data:
-                return
-            
-            request = json.loads(data.decode())
+            request = _loads(data)
             
             # Process request
             response = self._process_request(request)
             
             # Send response
-            client_socket.sendall(json.dumps(response).encode())
+            if isinstance(response, RawResponse):
+                _send_frame(client_socket, response.body, KIND_RAW)
+            elif type(response) is _Encoded:
+                _send_frame(client_socket, response.encoded)
+            else:
+                _send_frame(client_socket, _dumps(response))
         
         except json.JSONDecodeError as e:
-            error_response = {"status": "error", "error": f"Invalid JSON: {e}"}
-            client_socket.sendall(json.dumps(error_response).encode())
+            _send_frame(client_socket, _error(f"Invalid JSON: {e}").encoded)
         
         except Exception as e:
-            error_response = {"status": "error", "error": str(e)}
-            client_socket.sendall(json.dumps(error_response).encode())
+            _send_frame(client_socket, _error(str(e)).encoded)
         
         finally:
             client_socket.close()
     
-    def _process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _send_error(self, client_socket: socket.socket, message: str):
+        """Send an error response without processing a request."""
+        try:
+            _send_frame(client_socket, _error(message).encoded)
+        except OSError:
+            pass
+        finally:
+            client_socket.close()
+    
+    def _process_request(self, request: Dict[str, Any]) -> Union[Dict[str, Any], RawResponse]:
         """
         Process a client request.
         
@@ -260,55 +681,23 @@ class LikuDaemon:
             request: Request dictionary with 'action' and optional parameters
             
         Returns:
-            Response dictionary
+            Response dictionary, or a RawResponse for byte-streamed actions
         """
         action = request.get("action")
         
         if not action:
-            return {"status": "error", "error": "Missing 'action' field"}
-        
-        # Event bus operations
-        if action == "emit_event":
-            return self._emit_event(request)
-        
-        elif action == "get_events":
-            return self._get_events(request)
-        
-        # Tmux-specific operations (temporary direct access)
-        elif action == "list_sessions":
-            return self._list_sessions()
-        
-        elif action == "list_panes":
-            return self._list_panes(request)
-        
-        # Sandbox operations
-        elif action == "create_pane": # Legacy name, now means create_sandbox_resource
-            return self._create_sandbox_resource(request)
+            return _ERR_MISSING_ACTION
         
-        elif action == "kill_pane": # Legacy name
-            return self._kill_sandbox_resource(request)
+        # Liveness probes are the most frequent request; skip the table
+        if action == "ping":
+            return self._ping(request)
         
-        elif action == "send_keys":
-            return self._send_keys(request)
+        # Non-string actions (lists, dicts) would be unhashable as keys
+        handler = self._HANDLERS.get(action) if type(action) is str else None
+        if handler is None:
+            return _error(f"Unknown action: {action}")
         
-        elif action == "capture_pane": # Legacy name
-            return self._capture_sandbox_output(request)
-        
-        # State operations
-        elif action == "get_agent_sessions":
-            return self._get_agent_sessions()
-        
-        elif action == "start_agent_session":
-            return self._start_agent_session(request)
-        
-        elif action == "end_agent_session":
-            return self._end_agent_session(request)
-        
-        elif action == "ping":
-            return {"status": "ok", "message": "pong"}
-        
-        else:
-            return {"status": "error", "error": f"Unknown action: {action}"}
+        return handler(self, request)
     
     # Event bus handlers
     
@@ -320,7 +709,7 @@ class LikuDaemon:
         agent_name = request.get("agent_name")
         
         if not event_type:
-            return {"status": "error", "error": "Missing 'event_type'"}
+            return _ERR_MISSING_EVENT_TYPE
         
         event_file = self.event_bus.emit(
             event_type=event_type,
@@ -342,15 +731,76 @@ class LikuDaemon:
     
     # Tmux-specific handlers (leaky abstraction for now)
     
-    def _list_sessions(self) -> Dict[str, Any]:
+    def _get_tmux_sandbox(self) -> TmuxSandbox:
+        """Return the daemon's tmux sandbox, creating it on first use."""
+        if self._tmux_sandbox is None:
+            with self._tmux_lock:
+                if self._tmux_sandbox is None:
+                    self._tmux_sandbox = TmuxSandbox(self.event_bus)
+        return self._tmux_sandbox
+    
+    def _get_sandbox(self, agent_config: Dict[str, Any]) -> Sandbox:
+        """
+        Resolve the sandbox for an agent.
+        
+        tmux sandboxes share the daemon's tmux manager rather than each
+        keeping their own copy of its state.
+        
+        Args:
+            agent_config: Agent configuration (policies select the mode)
+            
+        Returns:
+            Sandbox instance
+        """
+        tmux_manager = None
+        if SandboxFactory.mode_for(agent_config) == "tmux":
+            tmux_manager = self._get_tmux_sandbox().tmux_manager
+        return SandboxFactory.get_sandbox(
+            agent_config, self.global_policies, self.event_bus, tmux_manager=tmux_manager
+        )
+    
+    def _cached_listing(self, key: Tuple[str, Optional[str]], build: Callable[[], _Encoded]) -> _Encoded:
+        """
+        Return a recent tmux listing, or build and cache a fresh one.
+        
+        Polling clients (TUIs, status bars) would otherwise spawn a tmux
+        subprocess and re-encode the result on every request.
+        
+        Args:
+            key: Cache key, (action, session)
+            build: Produces the encoded response on a miss
+            
+        Returns:
+            Encoded listing response
+        """
+        now = time.monotonic()
+        with self._list_cache_lock:
+            hit = self._list_cache.get(key)
+        if hit and now - hit[0] < LIST_CACHE_TTL:
+            return hit[1]
+        
+        response = build()
+        with self._list_cache_lock:
+            self._list_cache[key] = (now, response)
+        return response
+    
+    def _invalidate_listings(self):
+        """Drop cached tmux listings after a pane is created or killed."""
+        with self._list_cache_lock:
+            self._list_cache.clear()
+    
+    def _list_sessions(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """List tmux sessions."""
-        # This is a tmux-specific operation. We instantiate the backend directly.
-        tmux_sandbox = TmuxSandbox(self.event_bus)
-        sessions = tmux_sandbox.tmux_manager.list_sessions()
+        return self._cached_listing(("sessions", None), self._build_session_listing)
+    
+    def _build_session_listing(self) -> _Encoded:
+        """Query tmux for sessions and encode the response."""
+        # This is a tmux-specific operation, served by the daemon's tmux sandbox.
+        sessions = self._get_tmux_sandbox().tmux_manager.list_sessions()
         
-        return {
-            "status": "ok",
-            "sessions": [
+        return _Encoded(
+            status="ok",
+            sessions=[
                 {
                     "name": s.name,
                     "windows": s.windows,
@@ -359,18 +809,21 @@ class LikuDaemon:
                 }
                 for s in sessions
             ]
-        }
+        )
     
     def _list_panes(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """List tmux panes."""
-        # This is a tmux-specific operation.
         session = request.get("session")
-        tmux_sandbox = TmuxSandbox(self.event_bus)
-        panes = tmux_sandbox.tmux_manager.list_panes(session)
+        return self._cached_listing(("panes", session), lambda: self._build_pane_listing(session))
+    
+    def _build_pane_listing(self, session: Optional[str]) -> _Encoded:
+        """Query tmux for panes and encode the response."""
+        # This is a tmux-specific operation.
+        panes = self._get_tmux_sandbox().tmux_manager.list_panes(session)
         
-        return {
-            "status": "ok",
-            "panes": [
+        return _Encoded(
+            status="ok",
+            panes=[
                 {
                     "session": p.session,
                     "window_index": p.window_index,
@@ -383,7 +836,7 @@ class LikuDaemon:
                 }
                 for p in panes
             ]
-        }
+        )
 
     # Sandbox handlers
 
@@ -394,14 +847,14 @@ class LikuDaemon:
         command = request.get("command")
 
         if not agent_name or not session_key:
-            return {"status": "error", "error": "Missing 'agent_name' or 'session'"}
+            return _ERR_MISSING_AGENT_OR_SESSION
 
         # Start with the base config from agents.yaml
         agent_config = self.agent_configs.get(agent_name, {}).copy()
 
         # Load agent.json and merge its settings
         try:
-            agent_json_path = Path(__file__).parent.parent / "agents" / agent_name / "agent.json"
+            agent_json_path = _DEFAULT_AGENTS_DIR / agent_name / "agent.json"
             if agent_json_path.exists():
                 with open(agent_json_path, 'r') as f:
                     agent_json_config = json.load(f)
@@ -411,9 +864,9 @@ class LikuDaemon:
                     agent_config.setdefault("policies", {}).update(agent_json_config["policies"])
 
         except Exception as e:
-            print(f"Warning: Could not load or parse agent.json for '{agent_name}': {e}")
+            logger.warning("Could not load or parse agent.json for %r: %s", agent_name, e)
 
-        sandbox = SandboxFactory.get_sandbox(agent_config, self.global_policies, self.event_bus)
+        sandbox = self._get_sandbox(agent_config)
 
         try:
             resource = sandbox.create(
@@ -422,27 +875,29 @@ class LikuDaemon:
                 command=command,
                 config=agent_config
             )
+            self._invalidate_listings()
             return {"status": "ok", "pane": {"pane_id": resource.id, "pane_pid": resource.pid}}
         except Exception as e:
-            return {"status": "error", "error": f"Failed to create sandbox resource: {e}"}
+            return _error(f"Failed to create sandbox resource: {e}")
 
     def _kill_sandbox_resource(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Kill/destroy a sandbox resource."""
         pane_id = request.get("pane_id") # Legacy name
         if not pane_id:
-            return {"status": "error", "error": "Missing 'pane_id'"}
+            return _ERR_MISSING_PANE_ID
 
         session = self.state_backend.get_agent_session_by_pane_id(pane_id)
         agent_name = session.get("agent_name") if session else None
         agent_config = self.agent_configs.get(agent_name, {}) if agent_name else {}
         
-        sandbox = SandboxFactory.get_sandbox(agent_config, self.global_policies, self.event_bus)
+        sandbox = self._get_sandbox(agent_config)
         
         try:
             sandbox.kill(resource_id=pane_id, agent_name=agent_name)
-            return {"status": "ok"}
+            self._invalidate_listings()
+            return _OK
         except Exception as e:
-            return {"status": "error", "error": f"Failed to kill sandbox resource: {e}"}
+            return _error(f"Failed to kill sandbox resource: {e}")
 
     def _send_keys(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Send keys to a resource, with security validation."""
@@ -451,23 +906,23 @@ class LikuDaemon:
         literal = request.get("literal", False)
         
         if not pane_id or not keys:
-            return {"status": "error", "error": "Missing 'pane_id' or 'keys'"}
+            return _ERR_MISSING_PANE_OR_KEYS
 
         # Security Validation
         session = self.state_backend.get_agent_session_by_pane_id(pane_id)
         agent_name = session.get("agent_name") if session else None
         if not self._is_command_allowed(agent_name, keys):
-            return {"status": "error", "error": f"Command denied by security policy for agent '{agent_name}': {keys}"}
+            return _error(f"Command denied by security policy for agent '{agent_name}': {keys}")
         
         # Get sandbox and execute
         agent_config = self.agent_configs.get(agent_name, {}) if agent_name else {}
-        sandbox = SandboxFactory.get_sandbox(agent_config, self.global_policies, self.event_bus)
+        sandbox = self._get_sandbox(agent_config)
         
         try:
             sandbox.execute(resource_id=pane_id, command=keys, literal=literal)
-            return {"status": "ok"}
+            return _OK
         except Exception as e:
-            return {"status": "error", "error": f"Failed to send keys to sandbox resource: {e}"}
+            return _error(f"Failed to send keys to sandbox resource: {e}")
 
     def _capture_sandbox_output(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Capture output from a sandbox resource."""
@@ -475,24 +930,49 @@ class LikuDaemon:
         lines = request.get("start", -50) # Legacy key
         
         if not pane_id:
-            return {"status": "error", "error": "Missing 'pane_id'"}
+            return _ERR_MISSING_PANE_ID
         
         session = self.state_backend.get_agent_session_by_pane_id(pane_id)
         agent_name = session.get("agent_name") if session else None
         agent_config = self.agent_configs.get(agent_name, {}) if agent_name else {}
 
-        sandbox = SandboxFactory.get_sandbox(agent_config, self.global_policies, self.event_bus)
+        sandbox = self._get_sandbox(agent_config)
 
         try:
             # The 'start' parameter in the old API was negative, so we make it positive for 'lines'
             output = sandbox.capture_output(resource_id=pane_id, lines=abs(lines))
             return {"status": "ok", "output": output}
         except Exception as e:
-            return {"status": "error", "error": f"Failed to capture sandbox output: {e}"}
+            return _error(f"Failed to capture sandbox output: {e}")
+
+    def _capture_sandbox_output_raw(self, request: Dict[str, Any]) -> Union[Dict[str, Any], RawResponse]:
+        """
+        Capture output and send it back as raw bytes.
+        
+        Large scrollback captures are passed through as the sandbox produced
+        them: no JSON escaping pass and no JSON parse on the client. The tmux
+        and Docker backends also skip the intermediate str on the daemon.
+        """
+        pane_id = request.get("pane_id")
+        lines = request.get("start", -50) # Legacy key
+        
+        if not pane_id:
+            return _ERR_MISSING_PANE_ID
+        
+        session = self.state_backend.get_agent_session_by_pane_id(pane_id)
+        agent_name = session.get("agent_name") if session else None
+        agent_config = self.agent_configs.get(agent_name, {}) if agent_name else {}
+
+        sandbox = self._get_sandbox(agent_config)
+
+        try:
+            return RawResponse(sandbox.capture_output_bytes(resource_id=pane_id, lines=abs(lines)))
+        except Exception as e:
+            return _error(f"Failed to capture sandbox output: {e}")
 
     # State handlers
     
-    def _get_agent_sessions(self) -> Dict[str, Any]:
+    def _get_agent_sessions(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Get all agent sessions."""
         sessions = self.state_backend.get_sessions()
         
@@ -505,7 +985,7 @@ class LikuDaemon:
         config = request.get("config")
         
         if not agent_name:
-            return {"status": "error", "error": "Missing 'agent_name'"}
+            return _ERR_MISSING_AGENT_NAME
         
         session_key = self.state_backend.start_session(
             agent_name=agent_name,
@@ -521,25 +1001,152 @@ class LikuDaemon:
         exit_code = request.get("exit_code", 0)
         
         if not session_key:
-            return {"status": "error", "error": "Missing 'session_key'"}
+            return _ERR_MISSING_SESSION_KEY
         
         self.state_backend.end_session(session_key=session_key, exit_code=exit_code)
         
-        return {"status": "ok"}
+        return _OK
+    
+    def _ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a liveness probe."""
+        return _PONG
+    
+    # Action dispatch table, built once with the class. Every handler takes
+    # (daemon, request).
+    _HANDLERS: Dict[str, Callable[["LikuDaemon", Dict[str, Any]], Any]] = {
+        name: handler
+        for name, handler in (
+            # Event bus operations
+            ("emit_event", _emit_event),
+            ("get_events", _get_events),
+            # Tmux-specific operations (temporary direct access)
+            ("list_sessions", _list_sessions),
+            ("list_panes", _list_panes),
+            # Sandbox operations (legacy names)
+            ("create_pane", _create_sandbox_resource),
+            ("kill_pane", _kill_sandbox_resource),
+            ("send_keys", _send_keys),
+            ("capture_pane", _capture_sandbox_output),
+            ("capture_pane_raw", _capture_sandbox_output_raw),
+            # State operations
+            ("get_agent_sessions", _get_agent_sessions),
+            ("start_agent_session", _start_agent_session),
+            ("end_agent_session", _end_agent_session),
+            ("ping", _ping),
+        )
+    }
+
+
+def _fork_workers(processes: int) -> Tuple[int, List[int]]:
+    """
+    Pre-fork sibling daemon processes sharing one TCP port.
+    
+    Must run before any sockets or database connections are opened.
+    
+    Args:
+        processes: Total number of daemon processes, including this one
+        
+    Returns:
+        Worker index of the calling process (0 for the parent) and, in the
+        parent, the PIDs of the forked workers
+    """
+    workers: List[int] = []
+    for index in range(1, processes):
+        pid = os.fork()
+        if pid == 0:
+            return index, []
+        workers.append(pid)
+    return 0, workers
+
+
+def _reap_workers(workers: List[int], block: bool = False):
+    """
+    Collect exited workers so they do not linger as zombies.
+    
+    Only the given PIDs are waited on: a waitpid(-1) would also reap the
+    tmux subprocesses the daemon runs, out from under subprocess.
+    
+    Args:
+        workers: Worker PIDs still running; reaped ones are removed
+        block: Wait for every worker to exit instead of polling
+    """
+    for pid in list(workers):
+        try:
+            reaped, _ = os.waitpid(pid, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            reaped = pid
+        if reaped:
+            workers.remove(pid)
+
+
+def _stop_workers(workers: List[int]):
+    """Pass SIGTERM on to the workers and wait for them to exit."""
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    _reap_workers(workers, block=True)
+
+
+def _start_log_listener() -> QueueListener:
+    """
+    Move the root log handlers behind a queue drained by a background thread.
+    
+    Reactor and worker threads then only enqueue records; formatting and the
+    stderr write happen on the listener thread. Call after forking, since
+    threads do not survive fork().
+    
+    Returns:
+        The started listener; stop() it to flush pending records
+    """
+    root = logging.getLogger()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
 
 
 def main():
     """Main entry point."""
     import sys
     
-    daemon = LikuDaemon()
+    logging.basicConfig(
+        level=os.getenv("LIKU_LOG", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr
+    )
+    
+    worker_index, workers = 0, []
+    processes = int(os.getenv("LIKU_PROCESSES", 1))
+    if processes > 1:
+        if _resolve_use_tcp() and hasattr(socket, "SO_REUSEPORT") and hasattr(os, "fork"):
+            worker_index, workers = _fork_workers(processes)
+        else:
+            logger.warning("LIKU_PROCESSES requires TCP mode and SO_REUSEPORT; running a single process.")
+            os.environ["LIKU_PROCESSES"] = "1"
+    
+    log_listener = _start_log_listener()
+    daemon = LikuDaemon(worker_index=worker_index)
+    
+    if workers:
+        # The parent owns its workers: SIGTERM stops it and is passed on to
+        # them, and workers that exit early are reaped as they go
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        signal.signal(signal.SIGCHLD, lambda signum, frame: _reap_workers(workers))
     
     try:
         daemon.start()
     except KeyboardInterrupt:
-        print("\nInterrupted")
+        logger.info("Interrupted")
         daemon.stop()
         sys.exit(0)
+    finally:
+        if workers:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            _stop_workers(workers)
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -68,6 +68,22 @@ class Sandbox(ABC):
         """
         pass
 
+    def capture_output_bytes(self, resource_id: str, lines: int = 50) -> bytes:
+        """
+        Capture the recent output from a sandbox resource as raw bytes.
+        
+        Backends whose source already yields bytes should override this to skip
+        the str round trip; the default encodes capture_output() as UTF-8.
+        
+        Args:
+            resource_id: The ID of the sandbox resource.
+            lines: The number of recent lines to capture.
+            
+        Returns:
+            The captured output as bytes.
+        """
+        return self.capture_output(resource_id, lines).encode("utf-8", "replace")
+
     @abstractmethod
     def kill(self, resource_id: str, agent_name: Optional[str] = None) -> None:
         """
@@ -1,3 +1,4 @@
+import secrets
 import docker
 from docker.models.containers import Container
 from docker.errors import ImageNotFound, NotFound
@@ -15,9 +16,13 @@ class DockerSandbox(Sandbox):
     """
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.client = docker.from_env()
+        # Low-level client sharing the same connection; the create path uses it
+        # directly to skip the high-level Container wrappers and attr reloads
+        self.api = self.client.api
         self.config = config or {}
         self.container_name_prefix = self.config.get("container_name_prefix", "liku-agent-")
         self.default_image = self.config.get("default_image", "ubuntu:latest")
+        self._pulled: Dict[str, bool] = {}  # Images known to be available locally
         logger.info(f"DockerSandbox initialized with config: {self.config}")
 
     def create(
@@ -31,40 +36,71 @@ class DockerSandbox(Sandbox):
         Creates and starts a new Docker container for an agent session.
         """
         image = config.get("image", self.default_image)
-        container_name = f"{self.container_name_prefix}{session_key}"
+        # A random suffix keeps restarted sessions from colliding with a
+        # leftover container name (a 409 and a wasted create round trip)
+        container_name = f"{self.container_name_prefix}{session_key}-{secrets.token_hex(4)}"
         
-        try:
-            # Pull image if not available locally
-            self.client.images.pull(image)
-        except ImageNotFound:
-            logger.error(f"Docker image '{image}' not found.")
-            raise
-        except Exception as e:
-            logger.error(f"Error pulling Docker image '{image}': {e}")
-            raise
+        self._ensure_image(image)
 
         try:
             # Get the project root dynamically
             project_root = Path(__file__).parent.parent.parent
             
-            container = self.client.containers.run(
-                image,
+            host_config = self.api.create_host_config(
+                binds={str(project_root): {'bind': '/app', 'mode': 'ro'}}
+            )
+            create_args = dict(
                 command=command,
                 name=container_name,
-                detach=True,
                 tty=True,  # Allocate a pseudo-TTY for interactive processes
                 stdin_open=True, # Keep stdin open
-                volumes={
-                    str(project_root): {'bind': '/app', 'mode': 'ro'}
-                },
-                working_dir='/app' # Set working directory inside container
+                volumes=['/app'],
+                working_dir='/app', # Set working directory inside container
+                host_config=host_config
             )
-            logger.info(f"Docker container '{container.id}' created for agent '{agent_name}' (session: {session_key})")
-            return SandboxResource(id=container.id, pid=container.top()['Processes'][0][1] if container.top()['Processes'] else None)
+            try:
+                container_id = self.api.create_container(image, **create_args)['Id']
+            except ImageNotFound:
+                # The image was removed since it was cached as pulled
+                # (docker rmi, image prune); pull it again and retry once
+                logger.warning(f"Docker image '{image}' disappeared; pulling it again.")
+                self._pulled.pop(image, None)
+                self._ensure_image(image)
+                container_id = self.api.create_container(image, **create_args)['Id']
+            self.api.start(container_id)
+            logger.info(f"Docker container '{container_id}' created for agent '{agent_name}' (session: {session_key})")
         except Exception as e:
             logger.error(f"Error creating Docker container for agent '{agent_name}': {e}")
             raise
 
+        # One top() round trip; it can race container startup, and the
+        # container is usable without a pid
+        try:
+            procs = self.api.top(container_id).get('Processes') or []
+            pid = int(procs[0][1]) if procs else None
+        except Exception:
+            pid = None
+        return SandboxResource(id=container_id, pid=pid, details={"container_name": container_name})
+
+    def _ensure_image(self, image: str):
+        """
+        Makes sure an image is available locally, pulling it if needed.
+        """
+        if image in self._pulled:
+            return
+        try:
+            try:
+                self.client.images.get(image)
+            except ImageNotFound:
+                self.client.images.pull(image)
+            self._pulled[image] = True
+        except ImageNotFound:
+            logger.error(f"Docker image '{image}' not found.")
+            raise
+        except Exception as e:
+            logger.error(f"Error pulling Docker image '{image}': {e}")
+            raise
+
     def execute(self, resource_id: str, command: str, literal: bool = False) -> str:
         """
         Executes a command inside the specified Docker container.
@@ -81,15 +117,20 @@ class DockerSandbox(Sandbox):
             
             exit_code, output = container.exec_run(exec_command, stream=False, demux=True)
             
-            stdout = output[0].decode('utf-8') if output[0] else ""
-            stderr = output[1].decode('utf-8') if output[1] else ""
+            # Either stream may be None; 'replace' keeps binary TTY output
+            # from failing the call with UnicodeDecodeError
+            stdout_bytes, stderr_bytes = output or (None, None)
+            stdout_bytes = stdout_bytes or b""
+            stderr_bytes = stderr_bytes or b""
 
             if exit_code != 0:
+                stderr = stderr_bytes.decode('utf-8', 'replace')
                 logger.warning(f"Command '{command}' in container '{resource_id}' exited with code {exit_code}. Stderr: {stderr}")
                 # Optionally raise an exception or return error status
-                return f"Error (exit code {exit_code}): {stderr}\n{stdout}"
+                return f"Error (exit code {exit_code}): {stderr}\n{stdout_bytes.decode('utf-8', 'replace')}"
             
-            return stdout + stderr # Return both stdout and stderr for exec_run
+            # Return both stdout and stderr for exec_run, decoded in one pass
+            return (stdout_bytes + stderr_bytes).decode('utf-8', 'replace')
         except NotFound:
             logger.error(f"Docker container '{resource_id}' not found.")
             raise
@@ -126,4 +167,18 @@ class DockerSandbox(Sandbox):
             raise
         except Exception as e:
             logger.error(f"Error capturing output from container '{resource_id}': {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def capture_output_bytes(self, resource_id: str, lines: int = -1) -> bytes:
+        """
+        Captures the output from the specified Docker container without decoding it.
+        """
+        try:
+            container = self.client.containers.get(resource_id)
+            return container.logs(tail=lines, stream=False)
+        except NotFound:
+            logger.error(f"Docker container '{resource_id}' not found.")
+            raise
+        except Exception as e:
+            logger.error(f"Error capturing output from container '{resource_id}': {e}")
+            raise
@@ -3,11 +3,10 @@
 Factory for creating sandbox instances based on agent configuration.
 """
 
+import threading
 from typing import Any, Dict, Optional
 
 from liku.sandbox.base import Sandbox
-from liku.sandbox.docker_backend import DockerSandbox
-from liku.sandbox.tmux_backend import TmuxSandbox
 from liku.event_bus import EventBus
 
 
@@ -17,12 +16,27 @@ class SandboxFactory:
     """
     
     _instances: Dict[str, Sandbox] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def mode_for(agent_config: Dict[str, Any]) -> str:
+        """
+        Get the sandbox mode an agent runs in. Defaults to 'tmux'.
+        
+        Args:
+            agent_config: The specific configuration for the agent.
+            
+        Returns:
+            The sandbox mode name.
+        """
+        return agent_config.get("policies", {}).get("sandbox_mode", "tmux")
 
     @staticmethod
     def get_sandbox(
         agent_config: Dict[str, Any],
         global_config: Dict[str, Any],
-        event_bus: EventBus
+        event_bus: EventBus,
+        tmux_manager: Optional[Any] = None
     ) -> Sandbox:
         """
         Get a sandbox instance based on the agent's configuration.
@@ -35,31 +49,58 @@ class SandboxFactory:
             agent_config: The specific configuration for the agent.
             global_config: The global system configuration.
             event_bus: The system event bus, passed to sandbox backends.
+            tmux_manager: Existing tmux manager for a new tmux sandbox to share.
             
         Returns:
             An initialized Sandbox instance.
         """
-        # Determine the sandbox mode. Default to 'tmux'.
-        policies = agent_config.get("policies", {})
-        mode = policies.get("sandbox_mode", "tmux")
+        mode = SandboxFactory.mode_for(agent_config)
 
-        # Check cache first
-        if mode in SandboxFactory._instances:
-            return SandboxFactory._instances[mode]
+        # Check cache first (lock-free hot path)
+        instance = SandboxFactory._instances.get(mode)
+        if instance is not None:
+            return instance
 
-        # Create new instance if not cached
+        # Concurrent first requests must not each build a backend (e.g. run
+        # docker.from_env() twice), so creation is serialized and re-checked
+        with SandboxFactory._lock:
+            instance = SandboxFactory._instances.get(mode)
+            if instance is None:
+                instance = SandboxFactory._create(mode, global_config, event_bus, tmux_manager)
+                SandboxFactory._instances[mode] = instance
+            return instance
+
+    @staticmethod
+    def _create(
+        mode: str,
+        global_config: Dict[str, Any],
+        event_bus: EventBus,
+        tmux_manager: Optional[Any] = None
+    ) -> Sandbox:
+        """
+        Create a new sandbox backend for the given mode.
+        
+        Backends are imported on first use: importing docker is slow and pulls
+        in TLS/urllib3 even for tmux-only deployments.
+        
+        Args:
+            mode: Sandbox mode ('docker' or 'tmux').
+            global_config: The global system configuration.
+            event_bus: The system event bus, passed to sandbox backends.
+            tmux_manager: Existing tmux manager for a tmux sandbox to share.
+            
+        Returns:
+            An initialized Sandbox instance.
+        """
         if mode == "docker":
+            from liku.sandbox.docker_backend import DockerSandbox
             docker_config = global_config.get("docker", {})
-            instance = DockerSandbox(config=docker_config)
-            SandboxFactory._instances[mode] = instance
-            return instance
+            return DockerSandbox(config=docker_config)
             
         elif mode == "tmux":
+            from liku.sandbox.tmux_backend import TmuxSandbox
             tmux_config = global_config.get("tmux", {})
-            instance = TmuxSandbox(event_bus=event_bus, config=tmux_config)
-            SandboxFactory._instances[mode] = instance
-            return instance
+            return TmuxSandbox(event_bus=event_bus, config=tmux_config, tmux_manager=tmux_manager)
             
         else:
             raise ValueError(f"Unsupported sandbox mode: {mode}")
-
@@ -3,6 +3,7 @@
 tmux-based sandbox for executing agent commands in separate panes.
 """
 
+import subprocess
 from typing import Any, Dict, Optional
 
 from liku.sandbox.base import Sandbox, SandboxResource
@@ -16,15 +17,21 @@ class TmuxSandbox(Sandbox):
     environments for agents.
     """
 
-    def __init__(self, event_bus: EventBus, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        config: Optional[Dict[str, Any]] = None,
+        tmux_manager: Optional[TmuxManager] = None
+    ):
         """
         Initialize the tmux sandbox.
         
         Args:
             event_bus: The system event bus.
             config: Global tmux configuration.
+            tmux_manager: Existing manager to share instead of creating one.
         """
-        self.tmux_manager = TmuxManager(event_bus=event_bus)
+        self.tmux_manager = tmux_manager or TmuxManager(event_bus=event_bus)
 
     def create(
         self,
@@ -49,6 +56,16 @@ class TmuxSandbox(Sandbox):
         """Capture the output from the specified tmux pane."""
         return self.tmux_manager.capture_pane(pane_id=resource_id, start=-lines)
 
+    def capture_output_bytes(self, resource_id: str, lines: int = 50) -> bytes:
+        """Capture the output from the specified tmux pane without decoding it."""
+        result = subprocess.run(
+            ["tmux", "capture-pane", "-p", "-t", resource_id, "-S", str(-lines)],
+            capture_output=True, timeout=10
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"tmux command failed: {result.stderr.decode('utf-8', 'replace')}")
+        return result.stdout.strip()
+
     def kill(self, resource_id: str, agent_name: Optional[str] = None) -> None:
         """Kill the specified tmux pane."""
         self.tmux_manager.kill_pane(pane_id=resource_id, agent_name=agent_name)
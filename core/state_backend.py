@@ -3,20 +3,193 @@
 SQLite State Backend with schema migration support and concurrent access management.
 """
 
+import itertools
 import json
 import sqlite3
 import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Event payload codec, chosen once at import. Payloads are stored as UTF-8
+# JSON bytes (a BLOB); rows written as TEXT by older versions still decode.
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
+def _dicts_from_cursor(cursor: sqlite3.Cursor, size: int = 1000) -> List[Dict[str, Any]]:
+    """
+    Build row dicts from a tuple cursor, reading the column names once.
+    
+    Args:
+        cursor: Executed cursor whose connection has no row_factory
+        size: Rows fetched per fetchmany() call
+        
+    Returns:
+        One dict per row
+    """
+    cols = tuple(d[0] for d in cursor.description)
+    rows: List[Dict[str, Any]] = []
+    batch = cursor.fetchmany(size)
+    while batch:
+        rows.extend(dict(zip(cols, row)) for row in batch)
+        batch = cursor.fetchmany(size)
+    return rows
+
+
+def _dict_from_cursor(cursor: sqlite3.Cursor) -> Optional[Dict[str, Any]]:
+    """Return the cursor's first row as a dict, or None."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip((d[0] for d in cursor.description), row))
+
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in CURRENT_TIMESTAMP's format, with milliseconds."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+# The -> operator (SQLite 3.38+) returns JSON, so true/false stay booleans;
+# json_extract() would hand them back as SQL integers
+_JSON_ARROW = sqlite3.sqlite_version_info >= (3, 38, 0)
+
+
+@lru_cache(maxsize=None)
+def _project_payload(sql: str, field_count: int) -> str:
+    """Rewrite an event SELECT to return only `field_count` payload keys."""
+    # Payloads are stored as JSON bytes; CAST keeps SQLite from reading
+    # them as its binary JSONB format
+    pairs = ", ".join(["?, CAST(payload AS TEXT) -> ?"] * field_count)
+    return sql.replace(
+        "SELECT *",
+        "SELECT id, event_type, json_object(" + pairs + ") AS payload, "
+        "session_key, agent_name, created_at",
+        1
+    )
+
+
+@lru_cache(maxsize=None)
+def _insert_events_sql(count: int) -> str:
+    """Multi-row event INSERT for `count` rows, returning the new ids."""
+    return (
+        "INSERT INTO event_log (event_type, payload, session_key, agent_name, created_at) VALUES "
+        + ", ".join(["(?, ?, ?, ?, ?)"] * count)
+        + " RETURNING id"
+    )
 
 class StateBackend:
     """SQLite-backed state management with migration support."""
     
     # Schema version - increment when making schema changes
-    CURRENT_SCHEMA_VERSION = 1
+    CURRENT_SCHEMA_VERSION = 2
+    
+    # Seconds a get_approval_mode/get_pane result is served from memory
+    LOOKUP_CACHE_TTL = 2.0
+    
+    # Largest multi-row event INSERT (5 parameters per row)
+    EVENT_INSERT_CHUNK = 64
+    
+    # Prepared statements per connection (sqlite3 keys its LRU on SQL text)
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Per-connection tuning, applied in one executescript() round-trip:
+    # WAL for concurrent readers, a 64 MiB page cache, 256 MiB of mmap,
+    # in-memory temp tables and a bounded WAL. Busy waits come from the
+    # connect() timeout.
+    _CONNECTION_PRAGMAS = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA journal_size_limit=6144000;
+        PRAGMA wal_autocheckpoint=1000;
+        PRAGMA foreign_keys=ON;
+    """
+    
+    # Hot-path SQL, kept as constants so every call reuses the same cached
+    # statement instead of re-parsing and re-planning it
+    _SQL_UPSERT_SESSION = """
+        INSERT INTO agent_session 
+        (agent_name, session_key, terminal_id, pid, mode, updated_at)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(agent_name, session_key) 
+        DO UPDATE SET 
+            terminal_id=excluded.terminal_id,
+            pid=excluded.pid,
+            mode=excluded.mode,
+            updated_at=CURRENT_TIMESTAMP
+        RETURNING id
+    """
+    _SQL_SELECT_SESSION = """
+        SELECT * FROM agent_session 
+        WHERE agent_name = ? AND session_key = ?
+    """
+    _SQL_SELECT_SESSION_BY_PANE = """
+        SELECT * FROM agent_session 
+        WHERE terminal_id = ? AND status = 'active'
+    """
+    _SQL_UPDATE_SESSION_STATUS = """
+        UPDATE agent_session 
+        SET status = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE agent_name = ? AND session_key = ?
+    """
+    _SQL_UPSERT_PANE = """
+        INSERT INTO tmux_pane 
+        (session_key, terminal_id, window_name, pane_index, pane_pid, 
+         status, last_command, cwd, label, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(terminal_id)
+        DO UPDATE SET
+            session_key=excluded.session_key,
+            window_name=excluded.window_name,
+            pane_index=excluded.pane_index,
+            pane_pid=excluded.pane_pid,
+            status=excluded.status,
+            last_command=excluded.last_command,
+            cwd=excluded.cwd,
+            label=excluded.label,
+            updated_at=CURRENT_TIMESTAMP
+        RETURNING id
+    """
+    _SQL_SELECT_PANE = "SELECT * FROM tmux_pane WHERE terminal_id = ?"
+    # Columns: (mode,)
+    _SQL_SELECT_APPROVAL_MODE = "SELECT mode FROM approval_settings WHERE agent_name = ?"
+    _SQL_EVENTS_ALL = "SELECT * FROM event_log ORDER BY created_at DESC LIMIT ?"
+    _SQL_EVENTS_BY_TYPE = (
+        "SELECT * FROM event_log WHERE event_type = ? ORDER BY created_at DESC LIMIT ?"
+    )
+    _SQL_EVENTS_BY_SESSION = (
+        "SELECT * FROM event_log WHERE session_key = ? ORDER BY created_at DESC LIMIT ?"
+    )
+    _SQL_EVENTS_BY_TYPE_SESSION = (
+        "SELECT * FROM event_log WHERE event_type = ? AND session_key = ? "
+        "ORDER BY created_at DESC LIMIT ?"
+    )
+    _SQL_INSERT_EVENT = """
+        INSERT INTO event_log 
+        (event_type, payload, session_key, agent_name, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """
     
     def __init__(self, db_path: str):
         """
@@ -28,42 +201,146 @@ class StateBackend:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Connection pool for thread safety
+        # Connections: SQLite allows one writer at a time, so every write
+        # goes through a single connection serialized by _writer_lock, while each
+        # thread reads through its own read-only connection without locking
+        # (WAL readers never block the writer). All are tracked so
+        # close_all_connections() can reach those opened by other threads.
         self._local = threading.local()
-        self._lock = threading.RLock()
+        self._writer_lock = threading.Lock()
+        self._connections_lock = threading.Lock()
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._connections: List[sqlite3.Connection] = []
+        # Bumped by close_all_connections(); a thread whose cached reader is
+        # from an older generation reopens instead of using a closed handle
+        self._generation = 0
+        
+        # Short-lived caches for hot single-row lookups, keyed by agent name
+        # and terminal id: (expires_at, value). Writes through this backend
+        # bump the key's version and invalidate its entry; writes from other
+        # processes show up within LOOKUP_CACHE_TTL. Plain dict get/set/pop
+        # and next() on a count are atomic.
+        self._approval_cache: Dict[str, Tuple[float, str]] = {}
+        self._pane_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._approval_versions: Dict[str, int] = {}
+        self._pane_versions: Dict[str, int] = {}
+        self._cache_seq = itertools.count(1)
         
         # Initialize schema
         self._initialize_database()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection."""
-        if not hasattr(self._local, 'connection'):
-            self._local.connection = sqlite3.connect(
+    def _invalidate_cached(self, cache: Dict[str, Any], versions: Dict[str, int], key: str):
+        """Drop a cached lookup once the write that changed it has committed."""
+        versions[key] = next(self._cache_seq)
+        cache.pop(key, None)
+    
+    def _store_cached(self, cache: Dict[str, Any], versions: Dict[str, int],
+                      key: str, version: Optional[int], value: Any):
+        """
+        Cache a lookup unless a write to its key raced the read.
+        
+        A reader whose SELECT ran before a concurrent commit holds the old
+        row. If the writer's invalidation already happened, the version has
+        moved on and the entry is dropped again; if not, the writer's pop
+        comes after this store and removes it.
+        
+        Args:
+            cache: Cache to store into
+            versions: Write versions for the cache's keys
+            key: Agent name or terminal id
+            version: versions[key] as read before the SELECT
+            value: Row read by the SELECT
+        """
+        cache[key] = (time.monotonic() + self.LOOKUP_CACHE_TTL, value)
+        if versions.get(key) != version:
+            cache.pop(key, None)
+    
+    def _open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open and tune a new database connection.
+        
+        Args:
+            read_only: Open the database with mode=ro
+            
+        Returns:
+            The new connection, registered for close_all_connections()
+        """
+        if read_only:
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=30.0,
+                cached_statements=self.STATEMENT_CACHE_SIZE
+            )
+        else:
+            conn = sqlite3.connect(
                 str(self.db_path),
                 check_same_thread=False,
-                timeout=30.0
+                timeout=30.0,
+                cached_statements=self.STATEMENT_CACHE_SIZE
             )
-            self._local.connection.row_factory = sqlite3.Row
-            # Enable WAL mode for better concurrency
-            self._local.connection.execute("PRAGMA journal_mode=WAL")
-            self._local.connection.execute("PRAGMA synchronous=NORMAL")
-        return self._local.connection
+        # No row_factory: rows stay plain tuples built by the C layer;
+        # see _dicts_from_cursor() for the dict-returning reads
+        conn.executescript(self._CONNECTION_PRAGMAS)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the thread-local read-only database connection."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None or self._local.generation != self._generation:
+            # Read before opening: a close_all racing the open then bumps past it
+            generation = self._generation
+            conn = self._open_connection(read_only=True)
+            self._local.connection = conn
+            self._local.generation = generation
+        return conn
+    
+    def _get_writer_connection(self) -> sqlite3.Connection:
+        """Get the shared writer connection (caller holds _writer_lock)."""
+        if self._writer_conn is None:
+            self._writer_conn = self._open_connection()
+        return self._writer_conn
+
+    def warm_connection(self):
+        """Open the calling thread's connection ahead of its first query."""
+        self._get_connection()
     
     @contextmanager
     def _transaction(self):
-        """Context manager for database transactions."""
-        conn = self._get_connection()
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        """Context manager for write transactions on the writer connection."""
+        with self._writer_lock:
+            conn = self._get_writer_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
     
     def _initialize_database(self):
         """Initialize database schema and apply migrations."""
-        with self._lock, self._transaction() as conn:
-            # Create schema version table
+        # Fast path: the schema version lives in the database header
+        with self._writer_lock:
+            conn = self._get_writer_connection()
+            current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if current_version >= self.CURRENT_SCHEMA_VERSION:
+            return
+        
+        with self._transaction() as conn:
+            # Migrate under SQLite's exclusive lock, which also holds across
+            # processes, and check again once it is ours: another process
+            # may have migrated while this one waited
+            if not conn.in_transaction:
+                conn.execute("BEGIN EXCLUSIVE")
+            current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if current_version >= self.CURRENT_SCHEMA_VERSION:
+                return
+            
+            # Schema history table, kept for tooling and for databases
+            # created before user_version was tracked
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS schema_version (
                     version INTEGER PRIMARY KEY,
@@ -71,14 +348,15 @@ class StateBackend:
                 )
             """)
             
-            # Check current version
-            cursor = conn.execute("SELECT MAX(version) as ver FROM schema_version")
-            row = cursor.fetchone()
-            current_version = row['ver'] if row['ver'] is not None else 0
+            # Backfill from the history table
+            recorded = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+            if recorded is not None:
+                current_version = max(current_version, recorded)
             
             # Apply migrations
             if current_version < self.CURRENT_SCHEMA_VERSION:
                 self._apply_migrations(conn, current_version)
+            conn.execute(f"PRAGMA user_version = {int(self.CURRENT_SCHEMA_VERSION)}")
     
     def _apply_migrations(self, conn: sqlite3.Connection, from_version: int):
         """
@@ -90,6 +368,7 @@ class StateBackend:
         """
         migrations = {
             1: self._migrate_to_v1,
+            2: self._migrate_to_v2,
         }
         
         for version in range(from_version + 1, self.CURRENT_SCHEMA_VERSION + 1):
@@ -103,7 +382,9 @@ class StateBackend:
     
     def _migrate_to_v1(self, conn: sqlite3.Connection):
         """Initial schema creation."""
-        conn.executescript("""
+        # Statement by statement: executescript() would COMMIT first and
+        # release the migration's exclusive lock
+        script = """
             -- Agent sessions
             CREATE TABLE IF NOT EXISTS agent_session (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -190,6 +471,16 @@ class StateBackend:
                 updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 CHECK(mode IN ('auto', 'ask', 'deny', 'plan-review'))
             );
+        """
+        for statement in script.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+    
+    def _migrate_to_v2(self, conn: sqlite3.Connection):
+        """Compound index for filtered, newest-first event queries."""
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_event_type_session_created
+                ON event_log(event_type, session_key, created_at DESC)
         """)
     
     # Agent Session Methods
@@ -203,43 +494,24 @@ class StateBackend:
         mode: str = "interactive"
     ) -> int:
         """Create or update an agent session."""
-        with self._lock, self._transaction() as conn:
-            cursor = conn.execute("""
-                INSERT INTO agent_session 
-                (agent_name, session_key, terminal_id, pid, mode, updated_at)
-                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(agent_name, session_key) 
-                DO UPDATE SET 
-                    terminal_id=excluded.terminal_id,
-                    pid=excluded.pid,
-                    mode=excluded.mode,
-                    updated_at=CURRENT_TIMESTAMP
-                RETURNING id
-            """, (agent_name, session_key, terminal_id, pid, mode))
+        with self._transaction() as conn:
+            cursor = conn.execute(self._SQL_UPSERT_SESSION, (agent_name, session_key, terminal_id, pid, mode))
             
-            return cursor.fetchone()['id']
+            return cursor.fetchone()[0]
     
     def get_agent_session(self, agent_name: str, session_key: str) -> Optional[Dict[str, Any]]:
         """Get agent session by name and session key."""
         conn = self._get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM agent_session 
-            WHERE agent_name = ? AND session_key = ?
-        """, (agent_name, session_key))
+        cursor = conn.execute(self._SQL_SELECT_SESSION, (agent_name, session_key))
         
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        return _dict_from_cursor(cursor)
 
     def get_agent_session_by_pane_id(self, pane_id: str) -> Optional[Dict[str, Any]]:
         """Get active agent session by pane ID (terminal_id)."""
         conn = self._get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM agent_session 
-            WHERE terminal_id = ? AND status = 'active'
-        """, (pane_id,))
+        cursor = conn.execute(self._SQL_SELECT_SESSION_BY_PANE, (pane_id,))
         
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        return _dict_from_cursor(cursor)
     
     def list_agent_sessions(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all agent sessions, optionally filtered by status."""
@@ -255,16 +527,12 @@ class StateBackend:
                 "SELECT * FROM agent_session ORDER BY updated_at DESC"
             )
         
-        return [dict(row) for row in cursor.fetchall()]
+        return _dicts_from_cursor(cursor)
     
     def update_agent_status(self, agent_name: str, session_key: str, status: str):
         """Update agent session status."""
-        with self._lock, self._transaction() as conn:
-            conn.execute("""
-                UPDATE agent_session 
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE agent_name = ? AND session_key = ?
-            """, (status, agent_name, session_key))
+        with self._transaction() as conn:
+            conn.execute(self._SQL_UPDATE_SESSION_STATUS, (status, agent_name, session_key))
     
     # Tmux Pane Methods
     
@@ -281,39 +549,27 @@ class StateBackend:
         label: Optional[str] = None
     ) -> int:
         """Record or update a tmux pane."""
-        with self._lock, self._transaction() as conn:
-            cursor = conn.execute("""
-                INSERT INTO tmux_pane 
-                (session_key, terminal_id, window_name, pane_index, pane_pid, 
-                 status, last_command, cwd, label, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(terminal_id)
-                DO UPDATE SET
-                    session_key=excluded.session_key,
-                    window_name=excluded.window_name,
-                    pane_index=excluded.pane_index,
-                    pane_pid=excluded.pane_pid,
-                    status=excluded.status,
-                    last_command=excluded.last_command,
-                    cwd=excluded.cwd,
-                    label=excluded.label,
-                    updated_at=CURRENT_TIMESTAMP
-                RETURNING id
-            """, (session_key, terminal_id, window_name, pane_index, pane_pid,
+        with self._transaction() as conn:
+            cursor = conn.execute(self._SQL_UPSERT_PANE, (session_key, terminal_id, window_name, pane_index, pane_pid,
                   status, last_command, cwd, label))
-            
-            return cursor.fetchone()['id']
+            pane_id = cursor.fetchone()[0]
+        
+        self._invalidate_cached(self._pane_cache, self._pane_versions, terminal_id)
+        return pane_id
     
     def get_pane(self, terminal_id: str) -> Optional[Dict[str, Any]]:
         """Get pane by terminal ID."""
+        cached = self._pane_cache.get(terminal_id)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1]) if cached[1] is not None else None
+        
+        version = self._pane_versions.get(terminal_id)
         conn = self._get_connection()
-        cursor = conn.execute(
-            "SELECT * FROM tmux_pane WHERE terminal_id = ?",
-            (terminal_id,)
-        )
+        cursor = conn.execute(self._SQL_SELECT_PANE, (terminal_id,))
+        pane = _dict_from_cursor(cursor)
         
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        self._store_cached(self._pane_cache, self._pane_versions, terminal_id, version, pane)
+        return dict(pane) if pane is not None else None
     
     def list_panes(self, session_key: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all panes, optionally filtered by session."""
@@ -329,7 +585,7 @@ class StateBackend:
                 "SELECT * FROM tmux_pane ORDER BY updated_at DESC"
             )
         
-        return [dict(row) for row in cursor.fetchall()]
+        return _dicts_from_cursor(cursor)
     
     # Event Log Methods
     
@@ -341,45 +597,106 @@ class StateBackend:
         agent_name: Optional[str] = None
     ) -> int:
         """Log an event to the database."""
-        with self._lock, self._transaction() as conn:
-            cursor = conn.execute("""
-                INSERT INTO event_log 
-                (event_type, payload, session_key, agent_name)
-                VALUES (?, ?, ?, ?)
-            """, (event_type, json.dumps(payload), session_key, agent_name))
+        with self._transaction() as conn:
+            cursor = conn.execute(self._SQL_INSERT_EVENT, (event_type, _dumps(payload), session_key, agent_name, _utc_timestamp()))
             
             return cursor.lastrowid
     
+    def log_events(
+        self,
+        events: List[Tuple[str, Any, Optional[str], Optional[str]]]
+    ) -> List[int]:
+        """
+        Log a batch of events in a single transaction.
+        
+        Rows are written with multi-row INSERT ... RETURNING statements in
+        power-of-two chunks (at most EVENT_INSERT_CHUNK rows), so only a
+        handful of distinct statements ever reach the statement cache.
+        
+        Args:
+            events: (event_type, payload, session_key, agent_name) tuples
+            
+        Returns:
+            Ids of the written events, in order
+        """
+        # One timestamp for the whole batch instead of CURRENT_TIMESTAMP per row
+        created_at = _utc_timestamp()
+        rows = [
+            (event_type, _dumps(payload), session_key, agent_name, created_at)
+            for event_type, payload, session_key, agent_name in events
+        ]
+        if not rows:
+            return []
+        
+        ids: List[int] = []
+        with self._transaction() as conn:
+            # Take the write lock up front: a deferred transaction that has
+            # to upgrade mid-batch can fail with SQLITE_BUSY under contention
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            start = 0
+            while start < len(rows):
+                size = min(self.EVENT_INSERT_CHUNK, 1 << ((len(rows) - start).bit_length() - 1))
+                params = [value for row in rows[start:start + size] for value in row]
+                cursor = conn.execute(_insert_events_sql(size), params)
+                # RETURNING order is unspecified; AUTOINCREMENT ids follow row order
+                ids.extend(sorted(row[0] for row in cursor.fetchall()))
+                start += size
+        
+        return ids
+    
     def get_events(
         self,
         event_type: Optional[str] = None,
         session_key: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Get events, optionally filtered."""
-        conn = self._get_connection()
+        """
+        Get events, optionally filtered.
         
-        query = "SELECT * FROM event_log WHERE 1=1"
-        params = []
+        Args:
+            event_type: Only events of this type
+            session_key: Only events for this session
+            limit: Maximum number of events, newest first
+            fields: Top-level payload keys to return; SQLite extracts them
+                (on 3.38+) and the payload comes back holding only those
+                keys (null when absent). None returns the whole payload.
+            
+        Returns:
+            Event rows with decoded payloads
+        """
+        conn = self._get_connection()
         
-        if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type)
+        # One fixed statement per filter shape, so each stays prepared
+        if event_type and session_key:
+            sql, params = self._SQL_EVENTS_BY_TYPE_SESSION, [event_type, session_key, limit]
+        elif event_type:
+            sql, params = self._SQL_EVENTS_BY_TYPE, [event_type, limit]
+        elif session_key:
+            sql, params = self._SQL_EVENTS_BY_SESSION, [session_key, limit]
+        else:
+            sql, params = self._SQL_EVENTS_ALL, [limit]
         
-        if session_key:
-            query += " AND session_key = ?"
-            params.append(session_key)
+        if fields and _JSON_ARROW:
+            sql = _project_payload(sql, len(fields))
+            params = [
+                value
+                for field in fields
+                for value in (field, '$."' + field + '"')
+            ] + params
         
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
+        cursor = conn.execute(sql, params)
         
-        cursor = conn.execute(query, params)
+        events = _dicts_from_cursor(cursor)
+        for event in events:
+            event['payload'] = _loads(event['payload'])
         
-        events = []
-        for row in cursor.fetchall():
-            event = dict(row)
-            event['payload'] = json.loads(event['payload'])
-            events.append(event)
+        if fields and not _JSON_ARROW:
+            # Older SQLite: pick the keys after decoding instead
+            for event in events:
+                payload = event['payload'] if isinstance(event['payload'], dict) else {}
+                event['payload'] = {field: payload.get(field) for field in fields}
         
         return events
     
@@ -393,7 +710,7 @@ class StateBackend:
         context: Optional[str] = None
     ) -> int:
         """Add a guidance record."""
-        with self._lock, self._transaction() as conn:
+        with self._transaction() as conn:
             cursor = conn.execute("""
                 INSERT INTO guidance 
                 (agent_name, session_key, instructions, context)
@@ -424,7 +741,7 @@ class StateBackend:
         query += " ORDER BY created_at DESC"
         
         cursor = conn.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return _dicts_from_cursor(cursor)
     
     # Approval Settings Methods
     
@@ -433,36 +750,49 @@ class StateBackend:
         if mode not in ('auto', 'ask', 'deny', 'plan-review'):
             raise ValueError(f"Invalid approval mode: {mode}")
         
-        with self._lock, self._transaction() as conn:
+        with self._transaction() as conn:
             conn.execute("""
                 INSERT INTO approval_settings (agent_name, mode, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(agent_name)
                 DO UPDATE SET mode=excluded.mode, updated_at=CURRENT_TIMESTAMP
             """, (agent_name, mode))
+        self._invalidate_cached(self._approval_cache, self._approval_versions, agent_name)
     
     def get_approval_mode(self, agent_name: str) -> str:
         """Get approval mode for an agent."""
+        cached = self._approval_cache.get(agent_name)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        version = self._approval_versions.get(agent_name)
         conn = self._get_connection()
-        cursor = conn.execute(
-            "SELECT mode FROM approval_settings WHERE agent_name = ?",
-            (agent_name,)
-        )
+        cursor = conn.execute(self._SQL_SELECT_APPROVAL_MODE, (agent_name,))
+        mode = (cursor.fetchone() or ('ask',))[0]  # Default to 'ask'
         
-        row = cursor.fetchone()
-        return row['mode'] if row else 'ask'  # Default to 'ask'
+        self._store_cached(self._approval_cache, self._approval_versions, agent_name, version, mode)
+        return mode
     
     def close(self):
-        """Close database connections."""
-        if hasattr(self._local, 'connection'):
-            self._local.connection.close()
+        """Close the calling thread's database connection."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            with self._connections_lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
             del self._local.connection
     
     def close_all_connections(self):
-        """Close all database connections (for cleanup in tests)."""
-        # Close thread-local connection if exists
-        self.close()
-        # Note: Threading.local() connections are per-thread, so only close current thread
+        """Close the connections opened by every thread (for shutdown and tests)."""
+        with self._writer_lock, self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._writer_conn = None
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        if hasattr(self._local, 'connection'):
+            del self._local.connection
 
 
 def main():
@@ -522,7 +852,7 @@ def main():
     for event in events:
         print(f"  - {event['event_type']}: {event['payload']}")
     
-    db.close()
+    db.close_all_connections()
     print("\nAll tests passed!")
 
 
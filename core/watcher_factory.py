@@ -4,31 +4,97 @@ Cross-platform file watcher adapter with defensive output normalization
 and debounce mechanism.
 """
 
+import asyncio
+import atexit
 import os
 import platform
+import select
 import shutil
+import struct
 import subprocess
+import sys
+import tempfile
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterator, Optional
+from typing import AsyncIterator, Callable, Iterator, Optional
 
+try:
+    import ctypes
+except ImportError:  # interpreters built without _ctypes
+    ctypes = None
 
-@dataclass
+
+# dataclass(slots=True) needs 3.10; 3.9 keeps a per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Watcher-specific event names mapped to standardized kinds
+_KIND_MAP = {
+    'modify': 'modified',
+    'modified': 'modified',
+    'changed': 'modified',
+    'updated': 'modified',
+    'create': 'created',
+    'created': 'created',
+    'delete': 'deleted',
+    'deleted': 'deleted',
+    'moved_to': 'created',
+    'moved_from': 'deleted',
+}
+
+
+# FileSystemWatcher loop run with powershell -File; static so PowerShell
+# parses a script file instead of a fresh -Command string on every start.
+# A file is watched through its directory, filtered to its name.
+_POWERSHELL_SCRIPT = r"""
+param(
+    [switch]$Recursive,
+    [Parameter(ValueFromRemainingArguments = $true)]
+    [string[]]$Paths
+)
+
+$watchers = foreach ($path in $Paths) {
+    if (Test-Path -LiteralPath $path -PathType Container) {
+        $watcher = New-Object IO.FileSystemWatcher -ArgumentList $path, '*'
+        $watcher.IncludeSubdirectories = $Recursive.IsPresent
+    } else {
+        $watcher = New-Object IO.FileSystemWatcher -ArgumentList (Split-Path -Parent $path), (Split-Path -Leaf $path)
+    }
+    $watcher.EnableRaisingEvents = $true
+
+    foreach ($name in 'Changed', 'Created', 'Deleted') {
+        # Event actions run outside the pipeline; write to stdout directly
+        Register-ObjectEvent -InputObject $watcher -EventName $name -Action {
+            [Console]::Out.WriteLine("$($Event.SourceEventArgs.FullPath)|$($Event.SourceEventArgs.ChangeType)")
+        } | Out-Null
+    }
+
+    $watcher
+}
+
+while ($true) { Start-Sleep -Seconds 1 }
+"""
+
+
+@dataclass(**_SLOTS)
 class WatchCommand:
     """Represents a platform-specific watch command configuration."""
     runner: str
     args: list[str]
     delimiter: str = '\n'
+    separator: bytes = b'\n'  # Ends each record in the watcher's output
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WatchEvent:
     """Normalized watch event with path and event kind."""
     path: str
     kind: str
     timestamp: float
+    size: int = -1  # st_size, or -1 if the path could not be stat'ed
+    mtime_ns: int = 0  # st_mtime_ns, or 0 if the path could not be stat'ed
 
 
 class WatcherNotAvailable(RuntimeError):
@@ -39,15 +105,26 @@ class WatcherNotAvailable(RuntimeError):
 class Debouncer:
     """Debounce mechanism to handle rapid-fire events."""
     
-    def __init__(self, window: float = 0.5):
+    # Calls between sweeps for entries idle longer than 10 windows
+    SWEEP_INTERVAL = 1024
+    
+    def __init__(self, window: float = 0.5, max_entries: int = 4096):
         """
         Initialize debouncer.
         
         Args:
             window: Time window in seconds to debounce events
+            max_entries: Most (path, kind) keys remembered; the least
+                recently seen is evicted beyond this
         """
         self._window = window
-        self._last_events: dict[str, float] = defaultdict(float)
+        # Compared against time.monotonic_ns(): integer math, and immune
+        # to wall-clock jumps
+        self._window_ns = int(window * 1e9)
+        self._max_entries = max_entries
+        self._calls = 0
+        # LRU of last emit times, least recently seen first
+        self._last_events: OrderedDict[tuple[str, str], int] = OrderedDict()
     
     def should_emit(self, path: str, kind: str) -> bool:
         """
@@ -60,36 +137,247 @@ class Debouncer:
         Returns:
             True if event should be emitted, False if debounced
         """
-        key = f"{path}:{kind}"
-        now = time.time()
-        last_time = self._last_events[key]
+        key = (path, kind)
+        now = time.monotonic_ns()
         
-        if now - last_time >= self._window:
-            self._last_events[key] = now
-            return True
-        return False
+        self._calls += 1
+        if self._calls % self.SWEEP_INTERVAL == 0:
+            self._sweep(now)
+        
+        last_events = self._last_events
+        last_time = last_events.get(key)
+        
+        if last_time is not None and now - last_time < self._window_ns:
+            last_events.move_to_end(key)
+            return False
+        
+        last_events[key] = now
+        last_events.move_to_end(key)
+        if len(last_events) > self._max_entries:
+            last_events.popitem(last=False)
+        return True
+    
+    def _sweep(self, now: int):
+        """Drop entries idle for more than ten windows; they can no longer debounce."""
+        stale = now - 10 * self._window_ns
+        for key in [key for key, last_time in self._last_events.items() if last_time < stale]:
+            del self._last_events[key]
     
     def reset(self):
         """Reset debouncer state."""
         self._last_events.clear()
 
 
+class InotifyWatcher:
+    """
+    Linux inotify(7) watcher driven directly through libc.
+    
+    Stands in for an inotifywait subprocess: struct inotify_event records
+    are read straight off a non-blocking inotify descriptor, which epoll
+    waits on together with a pipe that stop() writes to.
+    """
+    IN_MODIFY = 0x00000002
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+    
+    # The same events inotifywait is asked for, mapped to standardized kinds
+    WATCH_MASK = IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_TO | IN_MOVED_FROM
+    _KINDS = (
+        (IN_MODIFY, 'modified'),
+        (IN_CREATE | IN_MOVED_TO, 'created'),
+        (IN_DELETE | IN_MOVED_FROM, 'deleted'),
+    )
+    
+    # struct inotify_event header: wd, mask, cookie, len; name follows
+    _EVENT = struct.Struct("iIII")
+    
+    # libc handle, or False once it is known to lack inotify
+    _libc = None
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Return whether inotify can be used from this process."""
+        return cls._load() is not None
+    
+    @classmethod
+    def _load(cls):
+        if cls._libc is None:
+            cls._libc = False
+            if ctypes is not None and sys.platform.startswith("linux") and hasattr(select, "epoll"):
+                try:
+                    libc = ctypes.CDLL(None, use_errno=True)
+                    libc.inotify_init1.argtypes = [ctypes.c_int]
+                    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                    cls._libc = libc
+                except (OSError, AttributeError):
+                    pass
+        return cls._libc or None
+    
+    def __init__(self, paths: list[str], recursive: bool = True):
+        """
+        Create the inotify instance and watch the given paths.
+        
+        Args:
+            paths: Files and/or directories to watch
+            recursive: Also watch subdirectories, including ones created later
+            
+        Raises:
+            OSError: inotify is unavailable or a watch could not be added
+        """
+        self._lib = self._load()
+        if self._lib is None:
+            raise OSError("inotify is not available")
+        self._recursive = recursive
+        self._wds: dict[int, str] = {}
+        self._fd = self._check(self._lib.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC))
+        self._stop_r, self._stop_w = os.pipe()
+        self._epoll = select.epoll()
+        self._epoll.register(self._fd, select.EPOLLIN)
+        self._epoll.register(self._stop_r, select.EPOLLIN)
+        try:
+            for path in paths:
+                self._add_tree(path)
+        except OSError:
+            self.close()
+            raise
+    
+    @staticmethod
+    def _check(result: int) -> int:
+        if result < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return result
+    
+    def _add_tree(self, path: str):
+        wd = self._check(self._lib.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK))
+        self._wds[wd] = path
+        if self._recursive and os.path.isdir(path):
+            for root, dirs, _ in os.walk(path):
+                for name in dirs:
+                    try:
+                        wd = self._check(self._lib.inotify_add_watch(self._fd, os.fsencode(os.path.join(root, name)), self.WATCH_MASK))
+                    except FileNotFoundError:
+                        continue  # removed while walking
+                    self._wds[wd] = os.path.join(root, name)
+    
+    def fileno(self) -> int:
+        """Return the non-blocking inotify descriptor, e.g. for add_reader()."""
+        return self._fd
+    
+    def read(self) -> list[tuple[str, str]]:
+        """Read every queued event as (path, kind) pairs without blocking."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                start = offset + self._EVENT.size
+                offset = start + length
+                if mask & self.IN_IGNORED:
+                    self._wds.pop(wd, None)
+                    continue
+                base = self._wds.get(wd)
+                if base is None:
+                    continue  # queue overflow (wd -1) or a watch already gone
+                name = buf[start:offset].rstrip(b"\0")
+                path = os.path.join(base, os.fsdecode(name)) if name else base
+                if self._recursive and mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    try:
+                        self._add_tree(path)
+                    except OSError:
+                        pass
+                for bits, kind in self._KINDS:
+                    if mask & bits:
+                        events.append((path, kind))
+                        break
+    
+    def read_batches(self, window: float = 0) -> Iterator[list[tuple[str, str]]]:
+        """
+        Yield batches of (path, kind) events until stop() is called.
+        
+        Args:
+            window: Seconds to keep collecting after events arrive, so a
+                burst comes back as one batch
+            
+        Yields:
+            Non-empty lists of (path, kind) pairs
+        """
+        while True:
+            ready = self._epoll.poll()
+            if any(fd == self._stop_r for fd, _ in ready):
+                return
+            events = self.read()
+            if window > 0:
+                deadline = time.monotonic() + window
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ready = self._epoll.poll(remaining)
+                    if not ready:
+                        break
+                    if any(fd == self._stop_r for fd, _ in ready):
+                        if events:
+                            yield events
+                        return
+                    events += self.read()
+            if events:
+                yield events
+    
+    def stop(self):
+        """Make read_batches() return; safe to call from another thread."""
+        try:
+            os.write(self._stop_w, b"\0")
+        except OSError:
+            pass
+    
+    def close(self):
+        """Release the inotify descriptor and its watches."""
+        if self._fd < 0:
+            return
+        self._epoll.close()
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            os.close(fd)
+        self._fd = -1
+
+
 class WatcherFactory:
     """Factory for creating platform-specific file watchers."""
     
-    def __init__(self, debounce_window: float = 0.5):
+    # Seconds watch() keeps gathering a burst of output before stat'ing it
+    STAT_WINDOW = 0.016
+    
+    # Temp file holding _POWERSHELL_SCRIPT, shared by all factories
+    _powershell_script_path: Optional[str] = None
+    
+    def __init__(self, debounce_window: float = 0.5, native: bool = True):
         """
         Initialize watcher factory.
         
         Args:
             debounce_window: Time window for debouncing events
+            native: Let watch() read inotify directly on Linux instead of
+                running inotifywait, when the kernel interface is available
         """
         self._system = platform.system()
         self._debouncer = Debouncer(window=debounce_window)
+        self._native = native
+        # shutil.which results, resolved once per runner on first build()
+        self._runners: dict[str, Optional[str]] = {}
     
     def build(self, directory: str, recursive: bool = True) -> WatchCommand:
         """
-        Build a platform-specific watch command.
+        Build a platform-specific watch command for one directory.
         
         Args:
             directory: Directory to watch
@@ -101,10 +389,33 @@ class WatcherFactory:
         Raises:
             WatcherNotAvailable: If no watcher is available on this platform
         """
-        if not os.path.exists(directory):
-            raise ValueError(f"Directory does not exist: {directory}")
+        return self.build_paths([directory], recursive)
+    
+    def build_paths(self, paths: list[str], recursive: bool = True) -> WatchCommand:
+        """
+        Build a platform-specific watch command for several paths.
+        
+        Files are watched directly rather than through their parent
+        directory, so unrelated changes next to them never reach the
+        watcher; ``recursive`` only applies to directories.
+        
+        Args:
+            paths: Files and/or directories to watch
+            recursive: Whether to watch directories recursively
+            
+        Returns:
+            WatchCommand configuration
+            
+        Raises:
+            WatcherNotAvailable: If no watcher is available on this platform
+        """
+        if not paths:
+            raise ValueError("No paths to watch")
+        for path in paths:
+            if not os.path.exists(path):
+                raise ValueError(f"Path does not exist: {path}")
         
-        candidates: list[Callable[[str, bool], Optional[WatchCommand]]] = [
+        candidates: list[Callable[[list[str], bool], Optional[WatchCommand]]] = [
             self._inotify_command,
             self._fswatch_command,
             self._powershell_command,
@@ -112,7 +423,7 @@ class WatcherFactory:
         
         for builder in candidates:
             try:
-                command = builder(directory, recursive)
+                command = builder(paths, recursive)
                 if command:
                     return command
             except Exception:
@@ -123,59 +434,65 @@ class WatcherFactory:
             "Please install: inotifywait (Linux), fswatch (macOS), or PowerShell (Windows)"
         )
     
-    def _inotify_command(self, directory: str, recursive: bool) -> Optional[WatchCommand]:
+    def _which(self, name: str) -> Optional[str]:
+        """Return the cached PATH lookup for a watcher runner."""
+        if name not in self._runners:
+            self._runners[name] = shutil.which(name)
+        return self._runners[name]
+    
+    def _inotify_command(self, paths: list[str], recursive: bool) -> Optional[WatchCommand]:
         """Build inotifywait command for Linux."""
-        if not shutil.which("inotifywait") or self._system != "Linux":
+        if self._system != "Linux" or not self._which("inotifywait"):
             return None
         
-        args = ["inotifywait", "-m", "-e", "modify,create,delete,move", "--format", "%w%f|%e"]
+        # -q drops the "Watches established" banners; only the events _KIND_MAP
+        # knows are requested, and %0 ends each record with a NUL so paths
+        # containing newlines survive (the newline inotifywait still appends
+        # is stripped with the record)
+        args = [
+            "inotifywait", "-m", "-q",
+            "-e", "modify", "-e", "create", "-e", "delete", "-e", "moved_to", "-e", "moved_from",
+            "--format", "%w%f|%e%0",
+        ]
         if recursive:
             args.insert(2, "-r")
-        args.append(directory)
+        args.extend(paths)
         
-        return WatchCommand("inotifywait", args, delimiter='|')
+        return WatchCommand("inotifywait", args, delimiter='|', separator=b'\0')
     
-    def _fswatch_command(self, directory: str, recursive: bool) -> Optional[WatchCommand]:
+    def _fswatch_command(self, paths: list[str], recursive: bool) -> Optional[WatchCommand]:
         """Build fswatch command for macOS."""
-        if not shutil.which("fswatch") or self._system != "Darwin":
+        if self._system != "Darwin" or not self._which("fswatch"):
             return None
         
         args = ["fswatch", "-0", "--event", "Updated", "--event", "Created"]
         if recursive:
             args.extend(["-r"])
-        args.append(directory)
+        args.extend(paths)
         
-        return WatchCommand("fswatch", args, delimiter='\0')
+        return WatchCommand("fswatch", args, delimiter='\0', separator=b'\0')
     
-    def _powershell_command(self, directory: str, recursive: bool) -> Optional[WatchCommand]:
+    def _powershell_command(self, paths: list[str], recursive: bool) -> Optional[WatchCommand]:
         """Build PowerShell FileSystemWatcher command for Windows."""
-        if not shutil.which("powershell") or self._system != "Windows":
+        if self._system != "Windows" or not self._which("powershell"):
             return None
         
-        script = f"""
-$watcher = New-Object IO.FileSystemWatcher -ArgumentList '{directory}', '*'
-$watcher.IncludeSubdirectories = ${str(recursive).lower()}
-$watcher.EnableRaisingEvents = $true
-
-Register-ObjectEvent -InputObject $watcher -EventName Changed -Action {{
-    Write-Output "$($Event.SourceEventArgs.FullPath)|Changed"
-}} | Out-Null
-
-Register-ObjectEvent -InputObject $watcher -EventName Created -Action {{
-    Write-Output "$($Event.SourceEventArgs.FullPath)|Created"
-}} | Out-Null
-
-Register-ObjectEvent -InputObject $watcher -EventName Deleted -Action {{
-    Write-Output "$($Event.SourceEventArgs.FullPath)|Deleted"
-}} | Out-Null
-
-while ($true) {{ Start-Sleep -Seconds 1 }}
-"""
+        args = ["powershell", "-NoLogo", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", self._powershell_script()]
+        if recursive:
+            args.append("-Recursive")
+        args.extend(os.path.abspath(path) for path in paths)
         
-        return WatchCommand(
-            "powershell",
-            ["powershell", "-NoLogo", "-NoProfile", "-Command", script]
-        )
+        return WatchCommand("powershell", args, delimiter='|')
+    
+    @classmethod
+    def _powershell_script(cls) -> str:
+        """Write the watcher script to a temp file once and return its path."""
+        if cls._powershell_script_path is None:
+            with tempfile.NamedTemporaryFile("w", suffix=".ps1", prefix="liku-watcher-", delete=False) as script:
+                script.write(_POWERSHELL_SCRIPT)
+            atexit.register(os.unlink, script.name)
+            cls._powershell_script_path = script.name
+        return cls._powershell_script_path
     
     def normalize_output(self, raw: str, delimiter: str = '\n') -> Optional[WatchEvent]:
         """
@@ -188,56 +505,125 @@ while ($true) {{ Start-Sleep -Seconds 1 }}
         Returns:
             WatchEvent if successfully parsed, None otherwise
         """
-        if not raw or not raw.strip():
-            return None
-        
         try:
-            # Handle different delimiters
-            parts = raw.strip().split(delimiter)
-            if len(parts) < 2:
+            # The kind comes after the last delimiter, so a path containing
+            # the delimiter stays whole; slice around it instead of splitting
+            idx = raw.rfind(delimiter)
+            if idx >= 0:
+                path = raw[:idx].strip()
+                kind = raw[idx + len(delimiter):].strip()
+            else:
                 # Try space-separated as fallback
-                parts = raw.strip().split(None, 1)
-            
-            if len(parts) < 2:
-                return None
-            
-            path = parts[0].strip()
-            kind = parts[1].strip()
+                parts = raw.split(None, 1)
+                if len(parts) < 2:
+                    return None
+                path, kind = parts[0], parts[1].strip()
             
             # Validate path exists or at least looks like a path
             if not path or len(path) < 2:
                 return None
             
             # Map various event types to standardized kinds
-            kind_map = {
-                'modify': 'modified',
-                'modified': 'modified',
-                'changed': 'modified',
-                'updated': 'modified',
-                'create': 'created',
-                'created': 'created',
-                'delete': 'deleted',
-                'deleted': 'deleted',
-                'moved_to': 'created',
-                'moved_from': 'deleted',
-            }
+            kind = kind.lower()
+            normalized_kind = _KIND_MAP.get(kind, kind)
             
-            normalized_kind = kind_map.get(kind.lower(), kind.lower())
-            
-            # Apply debouncing
-            if not self._debouncer.should_emit(path, normalized_kind):
-                return None
-            
-            return WatchEvent(
-                path=path,
-                kind=normalized_kind,
-                timestamp=time.time()
-            )
+            return self._make_event(path, normalized_kind)
         
         except (ValueError, IndexError) as e:
             # Defensive: log but don't crash on malformed input
             return None
     
+    def _make_event(self, path: str, kind: str) -> Optional[WatchEvent]:
+        """Debounce a parsed (path, standardized kind) pair into a WatchEvent."""
+        if not self._debouncer.should_emit(path, kind):
+            return None
+        return WatchEvent(path=path, kind=kind, timestamp=time.time())
+    
+    def _normalize_bytes(self, raw: bytes, delimiter: str = '\n') -> Optional[WatchEvent]:
+        """
+        Normalize one raw output record, decoding it only now.
+        
+        Args:
+            raw: Record bytes without the record separator
+            delimiter: Delimiter used to separate path and event kind
+            
+        Returns:
+            WatchEvent if successfully parsed, None otherwise
+        """
+        return self.normalize_output(raw.decode('utf-8', 'replace'), delimiter)
+    
+    @staticmethod
+    def _read_records(fd: int, separator: bytes, read_size: int = 65536) -> Iterator[bytes]:
+        """
+        Read separator-terminated records from a binary file descriptor.
+        
+        Args:
+            fd: File descriptor to read until EOF
+            separator: Byte sequence ending each record
+            read_size: Bytes requested per os.read() call
+            
+        Yields:
+            Each complete record; a trailing partial record is yielded at EOF
+        """
+        for batch in WatcherFactory._read_batches(fd, separator, 0, read_size):
+            yield from batch
+    
+    @staticmethod
+    def _split_records(buf: bytearray, separator: bytes) -> list[bytes]:
+        """Remove and return the complete records at the front of buf."""
+        records = []
+        start = 0
+        end = buf.find(separator)
+        while end >= 0:
+            records.append(bytes(buf[start:end]))
+            start = end + len(separator)
+            end = buf.find(separator, start)
+        del buf[:start]
+        return records
+    
+    @staticmethod
+    def _read_batches(fd: int, separator: bytes, window: float, read_size: int = 65536) -> Iterator[list[bytes]]:
+        """
+        Read separator-terminated records in batches.
+        
+        After the first read of a batch, keeps reading whatever arrives
+        within ``window`` seconds so a burst comes back as one batch.
+        
+        Args:
+            fd: File descriptor to read until EOF
+            separator: Byte sequence ending each record
+            window: Seconds to keep collecting after a read; 0 returns
+                each read's records as they come
+            read_size: Bytes requested per os.read() call
+            
+        Yields:
+            Lists of complete records; a trailing partial record is
+            yielded on its own at EOF
+        """
+        buf = bytearray()
+        eof = False
+        while not eof:
+            chunk = os.read(fd, read_size)
+            if not chunk:
+                break
+            buf += chunk
+            if window > 0:
+                deadline = time.monotonic() + window
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                        break
+                    chunk = os.read(fd, read_size)
+                    if not chunk:
+                        eof = True
+                        break
+                    buf += chunk
+            batch = WatcherFactory._split_records(buf, separator)
+            if batch:
+                yield batch
+        if buf:
+            yield [bytes(buf)]
+    
     def watch(self, directory: str, recursive: bool = True) -> Iterator[WatchEvent]:
         """
         Start watching a directory and yield normalized events.
@@ -249,24 +635,154 @@ while ($true) {{ Start-Sleep -Seconds 1 }}
         Yields:
             WatchEvent instances as files change
         """
+        batches = None
+        if self._native and self._system == "Linux" and InotifyWatcher.available():
+            if not os.path.exists(directory):
+                raise ValueError(f"Path does not exist: {directory}")
+            try:
+                batches = self._inotify_batches(InotifyWatcher([directory], recursive))
+            except OSError:
+                pass  # e.g. out of inotify watches; inotifywait may still cope
+        if batches is None:
+            batches = self._process_batches(directory, recursive)
+        
+        for batch in batches:
+            yield from self._stat_batch(batch)
+    
+    async def awatch(self, directory: str, recursive: bool = True) -> AsyncIterator[WatchEvent]:
+        """
+        Watch a directory from an asyncio event loop.
+        
+        The inotify descriptor (or the watcher's output pipe) is registered
+        with loop.add_reader(), so watchers share the loop's thread instead
+        of each blocking one. Loops without add_reader() (the Windows
+        proactor loop) step the blocking watch() in the default executor.
+        
+        Args:
+            directory: Directory to watch
+            recursive: Whether to watch recursively
+            
+        Yields:
+            WatchEvent instances as files change
+        """
+        loop = asyncio.get_running_loop()
+        if os.name == "nt":
+            events = self.watch(directory, recursive)
+            while True:
+                event = await loop.run_in_executor(None, next, events, None)
+                if event is None:
+                    return
+                yield event
+        
+        batches: asyncio.Queue = asyncio.Queue()
+        watcher = process = None
+        if self._native and self._system == "Linux" and InotifyWatcher.available():
+            if not os.path.exists(directory):
+                raise ValueError(f"Path does not exist: {directory}")
+            try:
+                watcher = InotifyWatcher([directory], recursive)
+            except OSError:
+                pass
+        
+        if watcher:
+            fd = watcher.fileno()
+            
+            def on_readable():
+                batch = [event for event in (self._make_event(path, kind) for path, kind in watcher.read()) if event]
+                if batch:
+                    batches.put_nowait(batch)
+        else:
+            command = self.build(directory, recursive)
+            process = subprocess.Popen(command.args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+            fd = process.stdout.fileno()
+            os.set_blocking(fd, False)
+            buf = bytearray()
+            
+            def on_readable():
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    return
+                if chunk:
+                    buf.extend(chunk)
+                    records = self._split_records(buf, command.separator)
+                else:
+                    # EOF: flush a trailing partial record, then finish
+                    loop.remove_reader(fd)
+                    records = [bytes(buf)] if buf else []
+                batch = [event for event in (self._normalize_bytes(record, command.delimiter) for record in records) if event]
+                if batch:
+                    batches.put_nowait(batch)
+                if not chunk:
+                    batches.put_nowait(None)
+        
+        loop.add_reader(fd, on_readable)
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    return
+                for event in self._stat_batch(batch):
+                    yield event
+        finally:
+            loop.remove_reader(fd)
+            if watcher:
+                watcher.close()
+            if process:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+    
+    @staticmethod
+    def _stat_batch(batch: list[WatchEvent]) -> list[WatchEvent]:
+        """Attach size/mtime to a batch, stat'ing each path only once."""
+        stats: dict[str, Optional[os.stat_result]] = {}
+        for event in batch:
+            if event.path not in stats:
+                try:
+                    stats[event.path] = os.stat(event.path)
+                except OSError:
+                    stats[event.path] = None
+            st = stats[event.path]
+            if st is not None:
+                event.size = st.st_size
+                event.mtime_ns = st.st_mtime_ns
+        return batch
+    
+    def _inotify_batches(self, watcher: "InotifyWatcher") -> Iterator[list[WatchEvent]]:
+        """Yield debounced events from a native inotify watcher."""
+        try:
+            for raw in watcher.read_batches(self.STAT_WINDOW):
+                batch = [event for event in (self._make_event(path, kind) for path, kind in raw) if event]
+                if batch:
+                    yield batch
+        finally:
+            watcher.close()
+    
+    def _process_batches(self, directory: str, recursive: bool) -> Iterator[list[WatchEvent]]:
+        """Yield debounced events from a watcher subprocess."""
         command = self.build(directory, recursive)
         
+        # Binary, unbuffered pipe: records are split on raw bytes and only
+        # the matched record is decoded
         process = subprocess.Popen(
             command.args,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            universal_newlines=True,
-            bufsize=1
+            bufsize=0
         )
         
+        # select() cannot wait on pipes on Windows, so there each read is
+        # its own batch
+        window = self.STAT_WINDOW if os.name != "nt" else 0
+        
         try:
-            for line in iter(process.stdout.readline, ''):
-                if not line:
-                    break
-                
-                event = self.normalize_output(line.strip(), command.delimiter)
-                if event:
-                    yield event
+            for records in self._read_batches(process.stdout.fileno(), command.separator, window):
+                batch = [event for event in (self._normalize_bytes(record, command.delimiter) for record in records) if event]
+                if batch:
+                    yield batch
         
         finally:
             process.terminate()
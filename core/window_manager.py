@@ -4,19 +4,42 @@ Cross-platform implementation of window management operations.
 """
 
 import json
-import re
+import operator
+import os
+import queue
+import shutil
 import subprocess
 import platform
 import tempfile
+import threading
+import time
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import sys
 
 from core.event_bus import EventBus 
 
+# Slotted Pane/Session on 3.10+, no per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Splits a tmux -F line into fields; bound once instead of per line
+_SPLIT_BAR = operator.methodcaller("split", "|")
+
+# The OS never changes under a running process, so resolve it once
+_SYSTEM = platform.system()
+
+# PATH lookups of tmux/wt.exe, done once per process
+_executables: Dict[str, Optional[str]] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    if name not in _executables:
+        _executables[name] = shutil.which(name)
+    return _executables[name]
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class Pane:
     """Represents a terminal pane/window."""
     session: str
@@ -28,7 +51,7 @@ class Pane:
     pane_width: int
     pane_height: int
 
-@dataclass
+@dataclass(**_SLOTS)
 class Session:
     """Represents a terminal session."""
     name: str
@@ -36,6 +59,137 @@ class Session:
     attached: bool
     created: str
 
+class TmuxControlClient:
+    """
+    Persistent tmux control-mode client (tmux -C attach).
+
+    Commands are written to one long-lived client and their replies read
+    back from its %begin/%end blocks, so each command costs a round trip
+    over the tmux socket rather than a fork/exec of a new tmux client.
+    """
+    # Seconds between attach attempts while no session exists
+    RETRY_INTERVAL = 1.0
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+
+    @staticmethod
+    def _quote(arg: str) -> str:
+        # A bare ";" separates commands, as it does in tmux's own argv
+        if arg == ";":
+            return arg
+        return "'" + arg.replace("'", "'\\''") + "'"
+
+    @staticmethod
+    def _pump(stream, lines: queue.Queue):
+        for line in stream:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)
+
+    def _start(self):
+        # -N: attach must never start a server of its own; one started
+        # only to report "no sessions" races the caller's next new-session
+        proc = subprocess.Popen(
+            ["tmux", "-N", "-C", "attach"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1
+        )
+        lines: queue.Queue = queue.Queue()
+        threading.Thread(target=self._pump, args=(proc.stdout, lines), name="tmux-control", daemon=True).start()
+        self._proc, self._lines = proc, lines
+        # Mute pane output notifications; the reply also confirms the attach
+        self._command(["refresh-client", "-f", "no-output"])
+
+    def _readline(self) -> str:
+        try:
+            line = self._lines.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("tmux control client did not reply")
+        if line is None:
+            raise ConnectionError("tmux control client exited")
+        return line
+
+    def _command(self, args: List[str]) -> str:
+        self._proc.stdin.write(" ".join(self._quote(a) for a in args) + "\n")
+        self._proc.stdin.flush()
+
+        # Each ";"-separated command gets its own reply block; read them all
+        # so none is left behind to be mistaken for the next command's reply
+        output = []
+        failed = False
+        for _ in range(args.count(";") + 1):
+            # Skip notifications and blocks not started by us (flags 0) until
+            # our reply opens, then collect it up to the matching %end/%error
+            while True:
+                fields = self._readline().split(" ")
+                if fields[0] == "%begin" and fields[3:4] == ["1"]:
+                    number = fields[2]
+                    break
+            while True:
+                line = self._readline()
+                fields = line.split(" ")
+                if fields[0] in ("%end", "%error") and fields[2:3] == [number]:
+                    break
+                output.append(line)
+            if fields[0] == "%error":
+                # tmux skips the rest of the line after a failed command
+                failed = True
+                break
+        text = "\n".join(output).strip()
+        if failed:
+            raise RuntimeError(f"tmux command failed: {text}")
+        return text
+
+    def run(self, args: List[str]) -> str:
+        """
+        Run a tmux command through the control client.
+
+        Args:
+            args: tmux command and arguments, as for the tmux CLI
+
+        Returns:
+            The command's output
+
+        Raises:
+            RuntimeError: tmux reported an error for the command
+            OSError: No control client could be attached (no server or
+                session yet) or it went away; the caller should fall back
+        """
+        if any("\n" in a for a in args):
+            raise ValueError("control mode commands cannot contain newlines")
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    if time.monotonic() < self._retry_at:
+                        raise ConnectionError("tmux control client not attached")
+                    self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+                    self._start()
+                return self._command(args)
+            except OSError:
+                self._close()
+                raise
+
+    def _close(self):
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+
+    def close(self):
+        """Detach the control client."""
+        with self._lock:
+            self._close()
+
 class WindowManager:
     """
     Abstract base class for window management operations.
@@ -53,6 +207,15 @@ class WindowManager:
     def list_panes(self, session: Optional[str] = None) -> List[Pane]:
         raise NotImplementedError
 
+    def snapshot(self) -> Tuple[List[Session], List[Pane]]:
+        """
+        List all sessions and all panes together.
+
+        Returns:
+            Tuple of (sessions, panes)
+        """
+        return self.list_sessions(), self.list_panes()
+
     def create_pane(
         self,
         session: str,
@@ -72,12 +235,84 @@ class TmuxWindowManager(WindowManager):
     Manager for tmux operations with event emission.
     """
     def _check_availability(self):
-        try:
-            subprocess.run(["tmux", "-V"], capture_output=True, check=True, timeout=5)
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        # A PATH lookup instead of running tmux -V: no fork per manager
+        if _which("tmux") is None:
             raise RuntimeError("tmux is not available or not responding")
 
+    # Spawn/kill events waiting for the emitter thread
+    EMIT_QUEUE_SIZE = 1024
+
+    # Fields for Session, as printed by list-sessions
+    SESSION_FORMAT = "#{session_name}|#{session_windows}|#{session_attached}|#{session_created}"
+
+    # Clients and their sessions, as printed by list-clients. session_attached
+    # counts control-mode clients too, including our own TmuxControlClient,
+    # so Session.attached is taken from the non-control clients instead
+    CLIENT_FORMAT = "#{client_session}|#{client_control_mode}"
+
+    # Appended to a listing so it also reports who is attached
+    _LIST_CLIENTS = [";", "list-clients", "-F", "C|" + CLIENT_FORMAT]
+
+    # Fields for Pane, shared by list-panes and split-window -P
+    PANE_FORMAT = "#{session_name}|#{window_index}|#{pane_index}|#{pane_id}|#{pane_pid}|#{pane_current_command}|#{pane_width}|#{pane_height}"
+
+    @staticmethod
+    def _parse_pane(line: str) -> Optional[Pane]:
+        # Pane fields are declared in PANE_FORMAT order, so build it positionally
+        try:
+            session, window_index, pane_index, pane_id, pane_pid, command, width, height = line.split("|", 7)
+            return Pane(session, int(window_index), int(pane_index), pane_id, int(pane_pid), command, int(width), int(height))
+        except ValueError:
+            return None
+
+    def __init__(self, event_bus: Optional[EventBus] = None):
+        super().__init__(event_bus)
+        # Commands go through one persistent control-mode client; set
+        # LIKU_TMUX_CONTROL=0 to fork a tmux client per command instead
+        self._control: Optional[TmuxControlClient] = None
+        if os.getenv("LIKU_TMUX_CONTROL", "1") != "0":
+            self._control = TmuxControlClient()
+
+        # Spawn/kill events are emitted from a background thread so the
+        # event bus's file and database writes stay off the tmux call path;
+        # the bound makes a stalled bus slow callers down instead of
+        # queueing without limit
+        self._emit_queue: queue.Queue = queue.Queue(maxsize=self.EMIT_QUEUE_SIZE)
+        self._emitter = threading.Thread(target=self._emit_loop, name="tmux-events", daemon=True)
+        self._emitter.start()
+
+    def _emit_loop(self):
+        while True:
+            item = self._emit_queue.get()
+            try:
+                if item is None:
+                    return
+                event_type, payload = item
+                self.event_bus.emit(event_type, payload=payload)
+            except Exception as e:
+                print(f"Warning: Could not emit {item[0]}: {e}")
+            finally:
+                self._emit_queue.task_done()
+
+    def _emit(self, event_type: str, payload: Dict[str, str]):
+        self._emit_queue.put((event_type, payload))
+
+    def flush_events(self):
+        """Block until every queued event has been emitted."""
+        self._emit_queue.join()
+
+    def close(self):
+        self._emit_queue.put(None)
+        self._emitter.join(timeout=5)
+        if self._control:
+            self._control.close()
+
     def _run_tmux(self, args: List[str]) -> str:
+        if self._control and not any("\n" in a for a in args):
+            try:
+                return self._control.run(args)
+            except OSError:
+                pass  # no server or session to attach to yet
         result = subprocess.run(["tmux"] + args, capture_output=True, text=True, timeout=10)
         if result.returncode != 0:
             raise RuntimeError(f"tmux command failed: {result.stderr}")
@@ -85,50 +320,74 @@ class TmuxWindowManager(WindowManager):
 
     def list_sessions(self) -> List[Session]:
         try:
-            output = self._run_tmux(["list-sessions", "-F", "#{session_name}|#{session_windows}|#{session_attached}|#{session_created}"])
+            output = self._run_tmux(["list-sessions", "-F", "S|" + self.SESSION_FORMAT, *self._LIST_CLIENTS])
         except RuntimeError:
             return []
         
-        sessions = []
-        for line in output.splitlines():
-            if not line: continue
-            parts = line.split("|")
-            if len(parts) >= 4:
-                sessions.append(Session(name=parts[0], windows=int(parts[1]), attached=parts[2] == "1", created=parts[3]))
-        return sessions
+        return self._parse_listing(output)[0]
 
     def list_panes(self, session: Optional[str] = None) -> List[Pane]:
-        target = f"-t {session}" if session else "-a"
+        target = ["-t", session] if session else ["-a"]
         try:
-            output = self._run_tmux(["list-panes", target, "-F", "#{session_name}|#{window_index}|#{pane_index}|#{pane_id}|#{pane_pid}|#{pane_current_command}|#{pane_width}|#{pane_height}"])
+            output = self._run_tmux(["list-panes", *target, "-F", self.PANE_FORMAT])
         except RuntimeError:
             return []
         
         panes = []
         for line in output.splitlines():
-            if not line: continue
-            parts = line.split("|")
-            if len(parts) >= 8:
-                panes.append(Pane(session=parts[0], window_index=int(parts[1]), pane_index=int(parts[2]), pane_id=parts[3], pane_pid=int(parts[4]), pane_current_command=parts[5], pane_width=int(parts[6]), pane_height=int(parts[7])))
+            pane = self._parse_pane(line)
+            if pane:
+                panes.append(pane)
         return panes
 
+    def snapshot(self) -> Tuple[List[Session], List[Pane]]:
+        # One tmux round trip for both listings; S|/P| prefixes tell the
+        # interleaved records apart
+        try:
+            output = self._run_tmux(["list-sessions", "-F", "S|" + self.SESSION_FORMAT, ";", "list-panes", "-a", "-F", "P|" + self.PANE_FORMAT, *self._LIST_CLIENTS])
+        except RuntimeError:
+            return [], []
+
+        return self._parse_listing(output)
+
+    def _parse_listing(self, output: str) -> Tuple[List[Session], List[Pane]]:
+        """Split S|/P|/C| prefixed listing lines into sessions and panes."""
+        session_parts, panes, attached = [], [], set()
+        for line in output.splitlines():
+            if line.startswith("P|"):
+                pane = self._parse_pane(line[2:])
+                if pane:
+                    panes.append(pane)
+            elif line.startswith("S|"):
+                parts = _SPLIT_BAR(line[2:])
+                if len(parts) >= 4:
+                    session_parts.append(parts)
+            elif line.startswith("C|"):
+                session, _, control_mode = line[2:].rpartition("|")
+                if control_mode != "1":
+                    attached.add(session)
+        sessions = [
+            Session(name=parts[0], windows=int(parts[1]), attached=parts[0] in attached, created=parts[3])
+            for parts in session_parts
+        ]
+        return sessions, panes
+
     def create_pane(self, session: str, command: Optional[List[str]] = None, agent_name: Optional[str] = None) -> Optional[Pane]:
-        cmd = ["split-window", "-h", "-t", session, "-P", "-F", "#{pane_id}"]
+        # -P prints the new pane in PANE_FORMAT, so no follow-up list-panes is needed
+        cmd = ["split-window", "-h", "-t", session, "-P", "-F", self.PANE_FORMAT]
         if command:
             cmd.extend(command)
         
-        pane_id = self._run_tmux(cmd)
-        panes = self.list_panes(session)
-        created_pane = next((p for p in panes if p.pane_id == pane_id), None)
+        created_pane = self._parse_pane(self._run_tmux(cmd))
         
         if created_pane:
-            self.event_bus.emit("agent.spawn", payload={"agent_name": agent_name or "unknown", "pane_id": pane_id, "session": session, "command": " ".join(command or [])})
+            self._emit("agent.spawn", {"agent_name": agent_name or "unknown", "pane_id": created_pane.pane_id, "session": session, "command": " ".join(command or [])})
         
         return created_pane
 
     def kill_pane(self, pane_id: str, agent_name: Optional[str] = None):
         self._run_tmux(["kill-pane", "-t", pane_id])
-        self.event_bus.emit("agent.kill", payload={"agent_name": agent_name or "unknown", "pane_id": pane_id})
+        self._emit("agent.kill", {"agent_name": agent_name or "unknown", "pane_id": pane_id})
 
     def ensure_session(self, session_name: str) -> bool:
         if any(s.name == session_name for s in self.list_sessions()):
@@ -141,17 +400,78 @@ import os
 import tempfile
 from pathlib import Path
 
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", wintypes.LONG),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+
+    def _win_processes() -> List[Tuple[int, int, str]]:
+        """Snapshot running processes as (pid, parent pid, exe name)."""
+        snapshot = _kernel32.CreateToolhelp32Snapshot(0x2, 0)  # TH32CS_SNAPPROCESS
+        if snapshot in (None, wintypes.HANDLE(-1).value):
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            entry = _PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(entry)
+            processes = []
+            ok = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while ok:
+                processes.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile.lower()))
+                ok = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+            return processes
+        finally:
+            _kernel32.CloseHandle(snapshot)
+
+    def _win_terminate(pid: int) -> bool:
+        handle = _kernel32.OpenProcess(0x0001, False, pid)  # PROCESS_TERMINATE
+        if not handle:
+            return False
+        try:
+            return bool(_kernel32.TerminateProcess(handle, 1))
+        finally:
+            _kernel32.CloseHandle(handle)
+
 class WindowsWindowManager(WindowManager):
     """
     Manager for Windows Terminal operations.
     This is a simplified implementation focusing on spawning new agent windows.
     """
     def _check_availability(self):
-        try:
-            subprocess.run(["wt.exe", "-v"], capture_output=True, check=True, timeout=5)
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        # wt.exe -v opens a version dialog, so only look it up on PATH
+        if _which("wt.exe") is None:
             raise RuntimeError("Windows Terminal (wt.exe) is not available or not in your PATH.")
 
+    # Seconds create_pane waits for the new tab's cmd.exe to appear; spawning
+    # blocks for up to this long, since the tab opens asynchronously
+    SPAWN_LOOKUP_TIMEOUT = 2.0
+
+    # Processes that host a Windows Terminal tab's shell
+    TERMINAL_HOSTS = ("windowsterminal.exe", "openconsole.exe")
+
+    # How many parents up a tab's cmd.exe may sit below its terminal host
+    TERMINAL_ANCESTOR_DEPTH = 3
+
+    def __init__(self, event_bus: Optional[EventBus] = None):
+        super().__init__(event_bus)
+        self._spawn_lock = threading.Lock()
+
     def list_sessions(self) -> List[Session]:
         print("Warning: Session listing is not implemented for Windows.")
         return [Session(name="default", windows=1, attached=True, created="")]
@@ -171,34 +491,103 @@ class WindowsWindowManager(WindowManager):
 
         # This is the robust command structure based on wt.exe documentation.
         # It sets the directory natively and passes a single command string to cmd /k.
+        # -w 0 opens the tab in the most recent Windows Terminal window
+        # instead of starting a new one.
         final_command = [
             "wt.exe",
+            "-w", "0",
             "new-tab",
             "--title", agent_name or "Agent",
             "--startingDirectory", project_root,
             "cmd", "/k", command_line_string
         ]
 
-        proc = subprocess.Popen(final_command)
+        # wt.exe only hands the tab to the running terminal and exits, so
+        # its PID is useless for killing the agent later; the tab's cmd.exe
+        # is found as the one Windows Terminal cmd.exe that was not running
+        # before the spawn
+        with self._spawn_lock:
+            before = self._cmd_pids()
+            subprocess.Popen(final_command)
+            pid = self._wait_for_new_cmd(before)
+
+        if pid is None:
+            print(f"Warning: Opened a tab for {agent_name or 'the agent'} but could not identify its process; it will not be tracked.", file=sys.stderr)
+            return None
         
-        pane_id = f"win_{proc.pid}"
+        pane_id = f"win_{pid}"
         self.event_bus.emit("agent.spawn", payload={"agent_name": agent_name or "unknown", "pane_id": pane_id, "session": session, "command": " ".join(command)})
         
         return Pane(
             session=session,
             window_index=0,
-            pane_index=proc.pid,
+            pane_index=pid,
             pane_id=pane_id,
-            pane_pid=proc.pid,
+            pane_pid=pid,
             pane_current_command=" ".join(command),
             pane_width=120,
             pane_height=30
         )
 
+    @classmethod
+    def _cmd_pids(cls) -> set:
+        """PIDs of cmd.exe processes hosted by Windows Terminal."""
+        try:
+            processes = _win_processes()
+        except OSError:
+            return set()
+        parent_of = {pid: ppid for pid, ppid, _ in processes}
+        exe_of = {pid: exe for pid, _, exe in processes}
+
+        def in_terminal(pid: int) -> bool:
+            # Walk up a few parents; PIDs are reused, so stop on cycles
+            seen = {pid}
+            for _ in range(cls.TERMINAL_ANCESTOR_DEPTH):
+                pid = parent_of.get(pid)
+                if pid is None or pid in seen:
+                    return False
+                if exe_of.get(pid) in cls.TERMINAL_HOSTS:
+                    return True
+                seen.add(pid)
+            return False
+
+        return {pid for pid, _, exe in processes if exe == "cmd.exe" and in_terminal(pid)}
+
+    def _wait_for_new_cmd(self, before: set) -> Optional[int]:
+        # Only an unambiguous match is accepted: a wrong PID here would make
+        # kill_pane terminate an unrelated process tree
+        deadline = time.monotonic() + self.SPAWN_LOOKUP_TIMEOUT
+        while time.monotonic() < deadline:
+            new = self._cmd_pids() - before
+            if len(new) == 1:
+                return new.pop()
+            if new:
+                return None
+            time.sleep(0.05)
+        return None
+
+    @staticmethod
+    def _kill_tree(pid: int):
+        """Terminate pid and its descendants, children first, like taskkill /T."""
+        children: Dict[int, List[int]] = {}
+        for child, parent, _ in _win_processes():
+            children.setdefault(parent, []).append(child)
+        # Parent PIDs can be stale and reused, so guard against cycles
+        order, seen, stack = [], {pid}, [pid]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            for child in children.get(current, ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        for target in reversed(order):
+            _win_terminate(target)
+
     def kill_pane(self, pane_id: str, agent_name: Optional[str] = None):
         try:
             pid = int(pane_id.split('_')[1])
-            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)])
+            self._kill_tree(pid)
             self.event_bus.emit("agent.kill", payload={"agent_name": agent_name or "unknown", "pane_id": pane_id})
         except (IndexError, ValueError) as e:
             print(f"Error killing pane {pane_id}: Invalid ID format. {e}", file=sys.stderr)
@@ -214,7 +603,7 @@ def get_window_manager(event_bus: Optional[EventBus] = None) -> WindowManager:
     """
     Factory function to get the appropriate window manager for the current OS.
     """
-    os_type = platform.system()
+    os_type = _SYSTEM
     if os_type == "Windows":
         return WindowsWindowManager(event_bus)
     elif os_type in ["Linux", "Darwin"]:
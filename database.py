@@ -1,19 +1,40 @@
+import atexit
+import os
+import queue
 import sqlite3
+import threading
 import time
 from datetime import datetime
 
 DB_NAME = "liku_memory.db"
 
+# log_event() only enqueues; one writer thread owns a long-lived connection
+# and commits queued rows in batches (up to _BATCH_SIZE rows or _BATCH_WINDOW
+# seconds), so concurrent loggers share one fsync instead of one each
+_BATCH_SIZE = 500
+_BATCH_WINDOW = 0.02
+
+_queue: "queue.Queue" = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_error = None
+
+
 def init_db():
     conn = sqlite3.connect(DB_NAME, timeout=5.0)
+    conn.execute("PRAGMA busy_timeout=5000")
     c = conn.cursor()
     c.execute("PRAGMA journal_mode=WAL")
     c.execute("PRAGMA synchronous=NORMAL")
+    c.execute("PRAGMA temp_store=MEMORY")
+    c.execute("PRAGMA mmap_size=268435456")
     c.execute('''CREATE TABLE IF NOT EXISTS agents
                  (name TEXT PRIMARY KEY, status TEXT, current_task TEXT, last_active TIMESTAMP, last_task_id INTEGER)''')
     c.execute('''CREATE TABLE IF NOT EXISTS logs
                  (id INTEGER PRIMARY KEY, agent_name TEXT, message TEXT,
                   type TEXT, timestamp TIMESTAMP)''')
+    # recent logs per agent
+    c.execute("CREATE INDEX IF NOT EXISTS idx_logs_agent_ts ON logs(agent_name, timestamp DESC)")
     # ensure last_task_id column exists if upgrading
     try:
         c.execute("PRAGMA table_info(agents)")
@@ -25,26 +46,155 @@ def init_db():
     conn.commit()
     conn.close()
 
+def _connect() -> sqlite3.Connection:
+    # opened by the logging thread, used by the writer thread
+    conn = sqlite3.connect(DB_NAME, timeout=5.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+def _write_batch(conn: sqlite3.Connection, batch: list) -> None:
+    # lock contention is absorbed by SQLite's busy handler (busy_timeout)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("INSERT INTO logs (agent_name, message, type, timestamp) VALUES (?, ?, ?, ?)", batch)
+        # one agents row per agent in the batch, stamped with its latest event;
+        # last_task_id is left alone on conflict rather than read and rewritten
+        last_active = {agent_name: ts for agent_name, _, _, ts in batch}
+        conn.executemany(
+            "INSERT INTO agents (name, status, current_task, last_active, last_task_id) VALUES (?, ?, ?, ?, NULL) "
+            "ON CONFLICT(name) DO UPDATE SET status=excluded.status, last_active=excluded.last_active",
+            [(agent_name, "ACTIVE", None, ts) for agent_name, ts in last_active.items()])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+def _record_error(error: Exception) -> None:
+    # keep the first failure since the last flush(); flush() raises it
+    global _error
+    if _error is None:
+        _error = error
+
+def _writer_loop(conn: sqlite3.Connection) -> None:
+    try:
+        while True:
+            item = _queue.get()
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.append(item)
+                # give concurrent loggers a moment to join this batch
+                deadline = time.monotonic() + _BATCH_WINDOW
+                while len(batch) < _BATCH_SIZE:
+                    try:
+                        item = _queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+            try:
+                if batch:
+                    _write_batch(conn, batch)
+            except Exception as e:
+                _record_error(e)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    _queue.task_done()
+            if stop:
+                return
+    except BaseException as e:
+        _record_error(RuntimeError(f"log writer stopped: {e!r}"))
+        raise
+    finally:
+        conn.close()
+        _writer_exited()
+
+def _writer_exited() -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is threading.current_thread():
+            _writer = None
+        # nothing will write what is still queued; release flush() waiters
+        dropped = 0
+        while True:
+            try:
+                item = _queue.get_nowait()
+            except queue.Empty:
+                break
+            dropped += item is not None
+            _queue.task_done()
+    if dropped:
+        _record_error(RuntimeError(f"log writer stopped with {dropped} log events unwritten"))
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            # connect on the caller's thread so a bad path or a lock timeout
+            # raises from log_event() instead of killing the writer silently
+            conn = _connect()
+            thread = threading.Thread(target=_writer_loop, args=(conn,), name="liku-db-writer", daemon=True)
+            thread.start()
+            _writer = thread
+
 def log_event(agent_name: str, message: str, type: str = "INFO") -> None:
-    for attempt in range(5):
-        try:
-            conn = sqlite3.connect(DB_NAME, timeout=5.0)
-            c = conn.cursor()
-            c.execute("INSERT INTO logs (agent_name, message, type, timestamp) VALUES (?, ?, ?, ?)",
-                      (agent_name, message, type, datetime.now()))
-            # keep existing last_task_id if present
-            existing = c.execute("SELECT last_task_id FROM agents WHERE name=?", (agent_name,)).fetchone()
-            last_task_id = existing[0] if existing else None
-            c.execute("INSERT OR REPLACE INTO agents (name, status, current_task, last_active, last_task_id) VALUES (?, ?, ?, ?, ?)",
-                      (agent_name, "ACTIVE", None, datetime.now(), last_task_id))
-            conn.commit()
-            conn.close()
+    _ensure_writer()
+    _queue.put_nowait((agent_name, message, type, datetime.now()))
+
+def flush() -> None:
+    """Block until every event logged so far is committed.
+
+    Raises the first error a batch write hit since the previous flush().
+    """
+    global _error
+    if not _queue.empty():
+        # events queued while a failed writer was exiting still need one
+        _ensure_writer()
+    _queue.join()
+    error, _error = _error, None
+    if error is not None:
+        raise error
+
+@atexit.register
+def _shutdown() -> None:
+    # short-lived CLIs log and exit at once; commit what they queued
+    global _writer, _error
+    try:
+        if _writer is None and _queue.empty():
             return
-        except sqlite3.OperationalError as e:
-            if "locked" in str(e).lower() and attempt < 4:
-                time.sleep(0.1 * (attempt + 1))
-                continue
-            raise
+        _ensure_writer()
+        writer = _writer
+        _queue.put(None)
+        if writer is not None:
+            writer.join(timeout=5)
+        _writer = None
+    except Exception as e:
+        _record_error(e)
+    finally:
+        # nobody is left to raise to
+        if _error is not None:
+            print(f"Warning: Could not write log events: {_error}")
+            _error = None
+
+def _reset_after_fork() -> None:
+    # the writer thread does not survive fork; the child starts its own
+    global _queue, _writer, _writer_lock, _error
+    _queue = queue.Queue()
+    _writer = None
+    _writer_lock = threading.Lock()
+    _error = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 if __name__ == "__main__":
     init_db()
@@ -6,7 +6,11 @@ import platform
 import os
 import shlex
 import asyncio
-from playwright.async_api import async_playwright, Playwright
+import urllib.request
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urljoin
 
 from spawn_util import spawn_agent
 from database import log_event
@@ -16,6 +20,83 @@ try:
 except ImportError:
     gw = None
 
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    def _print_window_titles():
+        """Print visible window titles straight from EnumWindows.
+
+        Same windows pygetwindow.getAllWindows() lists, without building a
+        wrapper object per HWND first.
+        """
+        def callback(hwnd, _lparam):
+            if _user32.IsWindowVisible(hwnd):
+                length = _user32.GetWindowTextLengthW(hwnd)
+                if length > 0:
+                    buffer = ctypes.create_unicode_buffer(length + 1)
+                    _user32.GetWindowTextW(hwnd, buffer, length + 1)
+                    if buffer.value:
+                        print(f"- {_printable(buffer.value)}")
+            return True
+
+        _user32.EnumWindows(_WNDENUMPROC(callback), 0)
+
+# Input options for live devices, placed before the user's -i: skip ffmpeg's
+# multi-second stream probe/analysis and take frames as soon as the device
+# delivers them. Files need the probe to find their codec parameters.
+FFMPEG_LOW_LATENCY_INPUT = ['-fflags', 'nobuffer', '-probesize', '32', '-analyzeduration', '0']
+
+# Only errors on stderr: no banner, no per-frame progress lines, no stdin polling
+FFMPEG_QUIET = ['-hide_banner', '-nostats', '-nostdin', '-loglevel', 'error']
+
+# Input formats that capture from a live device; anything else is a file
+LIVE_INPUT_FORMATS = {'gdigrab', 'dshow', 'v4l2', 'avfoundation', 'x11grab'}
+
+# Output extensions whose default video encoder is x264/x265, the encoders
+# that accept -tune zerolatency (libvpx for .webm, for one, rejects it)
+X26X_OUTPUT_EXTENSIONS = {'.mp4', '.m4v', '.mkv', '.mov', '.flv', '.ts'}
+
+def _is_live_input(input_args):
+    """Whether ffmpeg input args capture from a device rather than read a file."""
+    formats = {value for option, value in zip(input_args, input_args[1:]) if option == '-f'}
+    # -i /dev/video0 with no -f is a v4l2 device too
+    devices = [value for option, value in zip(input_args, input_args[1:]) if option == '-i' and value.startswith('/dev/')]
+    return bool(formats & LIVE_INPUT_FORMATS or devices)
+
+def _ffmpeg_input(input_args):
+    """The ffmpeg command up to and including the user's input args."""
+    command = ['ffmpeg', '-y', *FFMPEG_QUIET]
+    if _is_live_input(input_args):
+        command.extend(FFMPEG_LOW_LATENCY_INPUT)
+    command.extend(input_args)
+    return command
+
+def _seek_before_input(input_args):
+    """Move an -ss given after -i in front of it for file inputs.
+
+    Before -i, ffmpeg seeks through the container index; after it, ffmpeg
+    decodes and discards every frame up to the timestamp. Live devices have
+    nothing to seek in, so their arguments are left alone.
+    """
+    if _is_live_input(input_args) or '-i' not in input_args:
+        return input_args
+    first_input = input_args.index('-i')
+    for i in range(first_input + 1, len(input_args) - 1):
+        if input_args[i] == '-ss':
+            rest = input_args[:i] + input_args[i + 2:]
+            return rest[:first_input] + input_args[i:i + 2] + rest[first_input:]
+    return input_args
+
+def _printable(text):
+    """Replace what stdout cannot encode, so window titles with unprintable
+    characters don't crash print()."""
+    encoding = sys.stdout.encoding or "utf-8"
+    return text.encode(encoding, "replace").decode(encoding)
+
 def spawn_command(args):
     """Handles the 'spawn' command."""
     print(f"Spawning agent '{args.name}' with goal: '{args.goal}'")
@@ -29,52 +110,56 @@ def spawn_command(args):
 
 def stream_snapshot_command(args):
     """Handles the 'stream snapshot' command."""
-    # Encode to UTF-8 and decode back to the default encoding with error handling
-    # to prevent crashes on unprintable characters in window titles.
-    safe_input = args.input.encode('utf-8', 'replace').decode(sys.stdout.encoding, 'replace')
-    safe_output = args.output.encode('utf-8', 'replace').decode(sys.stdout.encoding, 'replace')
-    print(f"Taking a snapshot from '{safe_input}' and saving to '{safe_output}'...")
+    print(f"Taking a snapshot from '{_printable(args.input)}' and saving to '{_printable(args.output)}'...")
     
-    command = ['ffmpeg', '-y']
-    command.extend(shlex.split(args.input))
+    command = _ffmpeg_input(_seek_before_input(shlex.split(args.input)))
     command.extend([
+        '-an', '-sn',  # a still image: don't demux audio or subtitles
         '-vframes', '1',
         args.output
     ])
 
     try:
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        subprocess.run(command, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         print(f"Snapshot saved successfully to {args.output}")
         log_event("LikuCLI", f"Snapshot taken from {args.input}", "STREAM")
     except FileNotFoundError:
         print("Error: 'ffmpeg' not found. Please ensure it is installed and in your system's PATH.", file=sys.stderr)
     except subprocess.CalledProcessError as e:
         print(f"Error executing ffmpeg: {e}", file=sys.stderr)
-        print(f"FFmpeg stderr:\n{e.stderr}", file=sys.stderr)
+        print(f"FFmpeg stderr:\n{e.stderr.decode('utf-8', 'replace')}", file=sys.stderr)
 
 def stream_record_command(args):
     """Handles the 'stream record' command."""
-    print(f"Recording {args.duration} seconds from '{args.input}' to '{args.output}'...")
+    print(f"Recording {args.duration} seconds from '{_printable(args.input)}' to '{_printable(args.output)}'...")
 
-    command = ['ffmpeg', '-y']
-    command.extend(shlex.split(args.input))
+    input_args = shlex.split(args.input)
+    command = _ffmpeg_input(input_args)
+    if _is_live_input(input_args) and os.path.splitext(args.output)[1].lower() in X26X_OUTPUT_EXTENSIONS:
+        # x264/x265: no lookahead, so encoding keeps up with capture
+        command.extend(['-tune', 'zerolatency'])
     command.extend([
         '-t', str(args.duration),
         args.output
     ])
 
     try:
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        subprocess.run(command, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         print(f"Recording saved successfully to {args.output}")
         log_event("LikuCLI", f"Recorded {args.duration}s from {args.input}", "STREAM")
     except FileNotFoundError:
         print("Error: 'ffmpeg' not found. Please ensure it is installed and in your system's PATH.", file=sys.stderr)
     except subprocess.CalledProcessError as e:
         print(f"Error executing ffmpeg: {e}", file=sys.stderr)
-        print(f"FFmpeg stderr:\n{e.stderr}", file=sys.stderr)
+        print(f"FFmpeg stderr:\n{e.stderr.decode('utf-8', 'replace')}", file=sys.stderr)
 
 def list_windows_command(args):
     """Handles the 'list-windows' command."""
+    if sys.platform == "win32":
+        print("Listing open window titles:")
+        _print_window_titles()
+        return
+
     if gw is None:
         print("Error: 'pygetwindow' library is not installed. Please install it to use this feature.", file=sys.stderr)
         return
@@ -85,127 +170,276 @@ def list_windows_command(args):
         if window.title:
             print(f"- {window.title}")
 
-async def inspect_web_dom(args):
+# How long to let late requests settle after DOMContentLoaded (ms)
+NETWORK_IDLE_TIMEOUT_MS = 1500
+
+async def _goto(page, url):
+    """Load url, waiting for network idle only up to NETWORK_IDLE_TIMEOUT_MS.
+
+    Plain wait_until="networkidle" lingers past the real idle point and never
+    resolves on pages that long-poll or keep loading ads.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    await page.goto(url, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+
+@asynccontextmanager
+async def _browser_page():
+    """Launch headless Chromium once and yield (playwright, browser, page)."""
+    # Imported here: playwright is slow to import and only inspect-web needs it
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            page = await browser.new_page()
+            yield p, browser, page
+        finally:
+            await browser.close()
+
+# Each check is an async generator: code before its bare `yield` runs before
+# the page is loaded (attach listeners, validate arguments), code after runs
+# once the single shared navigation has finished. A check that returns
+# without yielding doesn't need the page.
+
+async def inspect_web_dom(page, args):
     """Uses Playwright to inspect a DOM element."""
     if not args.selector:
         print("Error: --selector is required for dom check.", file=sys.stderr)
         return
 
     print(f"Inspecting DOM for selector '{args.selector}' at {args.url}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        try:
-            await page.goto(args.url, wait_until="networkidle")
-            element = await page.query_selector(args.selector)
-            if element:
-                if args.attribute:
-                    attribute_value = await element.get_attribute(args.attribute)
-                    print(f"Attribute '{args.attribute}': {attribute_value}")
-                else:
-                    text_content = await element.text_content()
-                    print(f"Text content: {text_content}")
+    yield
+    try:
+        element = await page.query_selector(args.selector)
+        if element:
+            if args.attribute:
+                attribute_value = await element.get_attribute(args.attribute)
+                print(f"Attribute '{args.attribute}': {attribute_value}")
             else:
-                print(f"Error: Element not found for selector '{args.selector}'", file=sys.stderr)
-
-        except Exception as e:
-            print(f"Error inspecting DOM: {e}", file=sys.stderr)
+                text_content = await element.text_content()
+                print(f"Text content: {text_content}")
+        else:
+            print(f"Error: Element not found for selector '{args.selector}'", file=sys.stderr)
 
-        await browser.close()
+    except Exception as e:
+        print(f"Error inspecting DOM: {e}", file=sys.stderr)
 
-async def inspect_web_screenshot(args):
+async def inspect_web_screenshot(page, args):
     """Uses Playwright to take a screenshot of a specific element."""
     if not args.selector or not args.output:
         print("Error: --selector and --output are required for screenshot check.", file=sys.stderr)
         return
 
     print(f"Taking a screenshot of '{args.selector}' at {args.url}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        try:
-            await page.goto(args.url, wait_until="networkidle")
-            element = await page.query_selector(args.selector)
-            if element:
-                await element.screenshot(path=args.output)
-                print(f"Screenshot saved to {args.output}")
-            else:
-                print(f"Error: Element not found for selector '{args.selector}'", file=sys.stderr)
-
-        except Exception as e:
-            print(f"Error taking screenshot: {e}", file=sys.stderr)
-
-        await browser.close()
-
-async def inspect_web_network(args):
-    """Uses Playwright to inspect network requests."""
+    yield
+    try:
+        element = await page.query_selector(args.selector)
+        if element:
+            await element.screenshot(path=args.output)
+            print(f"Screenshot saved to {args.output}")
+        else:
+            print(f"Error: Element not found for selector '{args.selector}'", file=sys.stderr)
+
+    except Exception as e:
+        print(f"Error taking screenshot: {e}", file=sys.stderr)
+
+# Seconds to wait for the page in the --lite network check
+LITE_FETCH_TIMEOUT = 15
+
+class _ResourceCollector(HTMLParser):
+    """Collects the URLs an HTML page makes a browser fetch while loading."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "base" and attrs.get("href"):
+            self.base_url = urljoin(self.base_url, attrs["href"])
+            return
+        # <a href> is a link, not a load; <link href> (stylesheets, icons,
+        # preloads) and any src are fetched
+        url = attrs.get("href") if tag == "link" else attrs.get("src")
+        if url and not url.startswith(("data:", "javascript:")):
+            self.urls.append(urljoin(self.base_url, url))
+
+def _network_lite(args):
+    """Lists the resources referenced by the page's HTML, without a browser.
+
+    Requests made later by scripts are not seen, so this suits server-rendered
+    pages; SPAs still need the full browser check.
+    """
+    request = urllib.request.Request(args.url, headers={"User-Agent": "liku-cli"})
+    with urllib.request.urlopen(request, timeout=LITE_FETCH_TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        collector = _ResourceCollector(response.geturl())
+        collector.feed(response.read().decode(charset, "replace"))
+        collector.close()
+    return [f"GET {args.url}"] + [f"GET {url}" for url in collector.urls]
+
+async def inspect_web_network(page, args):
+    """Uses Playwright (or, with --lite, one HTTP fetch) to inspect network requests."""
     print(f"Inspecting network for URL: {args.url}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        requests = []
-        page.on("request", lambda request: requests.append(request))
-        
+    if getattr(args, "lite", False):
         try:
-            await page.goto(args.url, wait_until="networkidle")
-            print("Page loaded. Found network requests:")
-            if requests:
-                print("--- NETWORK REQUESTS ---")
-                for request in requests:
-                    print(f"  - {request.method} {request.url}")
-                print("------------------------")
-            else:
-                print("  No network requests found.")
-
+            requests = await asyncio.to_thread(_network_lite, args)
         except Exception as e:
-            print(f"Error navigating to page: {e}", file=sys.stderr)
+            print(f"Error fetching page: {e}", file=sys.stderr)
+            return
+        print("Page fetched. Found resources referenced by its HTML:")
+        print("--- NETWORK REQUESTS ---")
+        for request in requests:
+            print(f"  - {request}")
+        print("------------------------")
+        return
 
-        await browser.close()
+    requests = []
+    on_request = requests.append
+    page.on("request", on_request)
 
-async def inspect_web_console(args):
+    try:
+        yield
+        print("Page loaded. Found network requests:")
+        if requests:
+            print("--- NETWORK REQUESTS ---")
+            for request in requests:
+                print(f"  - {request.method} {request.url}")
+            print("------------------------")
+        else:
+            print("  No network requests found.")
+    finally:
+        page.remove_listener("request", on_request)
+
+async def inspect_web_console(page, args):
     """Uses Playwright to inspect the web console for errors."""
     print(f"Inspecting console for URL: {args.url}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        errors = []
-        page.on("console", lambda msg: errors.append(msg) if msg.type == "error" else None)
-        
-        try:
-            await page.goto(args.url, wait_until="networkidle")
-            print("Page loaded. Found console messages:")
-            if errors:
-                print("--- CONSOLE ERRORS ---")
-                for error in errors:
-                    print(f"  - {error.text}")
-                print("----------------------")
-            else:
-                print("  No console errors found.")
+    errors = []
+    def on_console(msg):
+        if msg.type == "error":
+            errors.append(msg)
+    page.on("console", on_console)
 
-        except Exception as e:
-            print(f"Error navigating to page: {e}", file=sys.stderr)
+    try:
+        yield
+        print("Page loaded. Found console messages:")
+        if errors:
+            print("--- CONSOLE ERRORS ---")
+            for error in errors:
+                print(f"  - {error.text}")
+            print("----------------------")
+        else:
+            print("  No console errors found.")
+    finally:
+        page.remove_listener("console", on_console)
+
+INSPECT_WEB_CHECKS = {
+    "console": inspect_web_console,
+    "network": inspect_web_network,
+    "screenshot": inspect_web_screenshot,
+    "dom": inspect_web_dom,
+}
+
+def _parse_checks(value):
+    """argparse type for --check: one check or a comma-separated list."""
+    checks = [check.strip() for check in value.split(",") if check.strip()]
+    unknown = [check for check in checks if check not in INSPECT_WEB_CHECKS]
+    if not checks or unknown:
+        raise argparse.ArgumentTypeError(
+            f"Unknown check '{','.join(unknown) or value}'. Valid options are: {', '.join(INSPECT_WEB_CHECKS)}"
+        )
+    return checks
+
+def _needs_browser(args, checks):
+    return any(check != "network" or not getattr(args, "lite", False) for check in checks)
+
+async def _advance(run):
+    """Run a check up to its next yield; False once it has finished."""
+    try:
+        await run.__anext__()
+        return True
+    except StopAsyncIteration:
+        return False
+
+# Resource types a check can do without: the page load aborts the ones every
+# waiting check can skip. console and network skip nothing, since aborted
+# loads would show up as console errors and hide the requests they trigger
+SKIPPABLE_RESOURCES = {
+    "dom": frozenset({"image", "media", "font", "stylesheet"}),
+    "screenshot": frozenset({"media", "font"}),
+}
+
+async def _skip_resources(page, resource_types):
+    async def route_request(route):
+        if route.request.resource_type in resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+    await page.route("**/*", route_request)
+
+async def _run_on_page(page, args, checks):
+    # Every check subscribes before the one navigation, so console and network
+    # see the same load that dom and screenshot then query
+    waiting = []
+    for check in checks:
+        run = INSPECT_WEB_CHECKS[check](page, args)
+        if await _advance(run):
+            waiting.append((check, run))
+    if not waiting:
+        return
+    skippable = frozenset.intersection(*(SKIPPABLE_RESOURCES.get(check, frozenset()) for check, _ in waiting))
+    try:
+        if skippable:
+            await _skip_resources(page, skippable)
+        await _goto(page, args.url)
+    except Exception as e:
+        print(f"Error navigating to page: {e}", file=sys.stderr)
+        for _, run in waiting:
+            await run.aclose()
+        return
+    for _, run in waiting:
+        await _advance(run)
 
-        await browser.close()
+async def _run_checks(args, checks):
+    if not _needs_browser(args, checks):
+        await _run_on_page(None, args, checks)
+        return
+    # One browser launch, page and page load shared by every requested check
+    async with _browser_page() as (_, _, page):
+        await _run_on_page(page, args, checks)
 
 def inspect_web_command(args):
     """Dispatcher for inspect-web commands."""
-    if args.check == "console":
-        asyncio.run(inspect_web_console(args))
-    elif args.check == "network":
-        asyncio.run(inspect_web_network(args))
-    elif args.check == "screenshot":
-        asyncio.run(inspect_web_screenshot(args))
-    elif args.check == "dom":
-        asyncio.run(inspect_web_dom(args))
-    else:
-        print(f"Error: Unknown check '{args.check}'. Valid options are: console, network, screenshot, dom", file=sys.stderr)
+    try:
+        checks = _parse_checks(args.check) if isinstance(args.check, str) else args.check
+    except argparse.ArgumentTypeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+    if _needs_browser(args, checks):
+        try:
+            import playwright  # noqa: F401
+        except ImportError:
+            print("Error: 'playwright' library is not installed. Please install it to use this feature.", file=sys.stderr)
+            return
+    asyncio.run(_run_checks(args, checks))
 
-def main():
-    """Main entry point for the Liku CLI."""
+INPUT_HELP = """
+The full ffmpeg input string.
+Examples:
+  Windows Desktop: -f gdigrab -i desktop
+  Windows Webcam:  -f dshow -i video="Your Camera Name"
+  Linux Webcam:    -i /dev/video0
+"""
+
+@lru_cache(maxsize=None)
+def _build_parser():
+    """Build the CLI's argument parser once per process."""
     parser = argparse.ArgumentParser(
         description="Liku CLI: A command-line interface for interacting with Liku agents and tools.",
         formatter_class=argparse.RawTextHelpFormatter
@@ -222,21 +456,13 @@ def main():
     parser_stream = subparsers.add_parser("stream", help="Manage streaming functionalities.")
     stream_subparsers = parser_stream.add_subparsers(dest="stream_command", required=True, help="Stream commands")
 
-    input_help = """
-The full ffmpeg input string.
-Examples:
-  Windows Desktop: -f gdigrab -i desktop
-  Windows Webcam:  -f dshow -i video="Your Camera Name"
-  Linux Webcam:    -i /dev/video0
-"""
-
     parser_snapshot = stream_subparsers.add_parser("snapshot", help="Take a single snapshot from a video source.")
-    parser_snapshot.add_argument("--input", required=True, help=input_help)
+    parser_snapshot.add_argument("--input", required=True, help=INPUT_HELP)
     parser_snapshot.add_argument("--output", required=True, help="Path to save the output image file.")
     parser_snapshot.set_defaults(func=stream_snapshot_command)
 
     parser_record = stream_subparsers.add_parser("record", help="Record a video clip from a source.")
-    parser_record.add_argument("--input", required=True, help=input_help)
+    parser_record.add_argument("--input", required=True, help=INPUT_HELP)
     parser_record.add_argument("--output", required=True, help="Path to save the output video file.")
     parser_record.add_argument("--duration", type=int, default=15, help="Duration of the recording in seconds (default: 15).")
     parser_record.set_defaults(func=stream_record_command)
@@ -248,14 +474,18 @@ Examples:
     # --- Inspect Web Command ---
     parser_inspect_web = subparsers.add_parser("inspect-web", help="Inspect a web page using headless browser.")
     parser_inspect_web.add_argument("--url", required=True, help="The URL of the web page to inspect.")
-    parser_inspect_web.add_argument("--check", required=True, choices=['console', 'network', 'screenshot', 'dom'], help="The specific check to perform.")
+    parser_inspect_web.add_argument("--check", required=True, type=_parse_checks, help="The check(s) to perform, comma-separated: console, network, screenshot, dom.\nSeveral checks share one browser launch and page load.")
     parser_inspect_web.add_argument("--selector", help="CSS selector for the element to inspect (used with 'screenshot' and 'dom').")
     parser_inspect_web.add_argument("--output", help="Output file path (used with 'screenshot').")
     parser_inspect_web.add_argument("--attribute", help="Attribute to retrieve from the element (used with 'dom').")
+    parser_inspect_web.add_argument("--lite", action="store_true", help="For 'network': fetch the HTML and list the resources it references\ninstead of launching a browser. Misses requests made by scripts.")
     parser_inspect_web.set_defaults(func=inspect_web_command)
+    return parser
 
-
-    args = parser.parse_args()
+def main(argv=None):
+    """Main entry point for the Liku CLI."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
     
     if hasattr(args, 'func'):
         args.func(args)
@@ -6,18 +6,22 @@ AGENT_NAME = "SnapshotAgent"
 
 try:
     conn = sqlite3.connect(DB_NAME)
+    conn.execute("PRAGMA mmap_size=268435456")
     c = conn.cursor()
     
     print(f"--- Reading last 5 logs for agent: {AGENT_NAME} ---")
     
-    # Fetch all types of logs to get a full picture
-    c.execute("SELECT timestamp, type, message FROM logs WHERE agent_name=? ORDER BY id DESC LIMIT 5", (AGENT_NAME,))
+    # Fetch all types of logs to get a full picture; the inner query walks
+    # idx_logs_agent_ts backwards, the outer one restores chronological order
+    c.execute("""SELECT timestamp, type, message FROM
+                 (SELECT timestamp, type, message FROM logs WHERE agent_name=? ORDER BY timestamp DESC LIMIT 5)
+                 ORDER BY timestamp ASC""", (AGENT_NAME,))
     rows = c.fetchall()
     
     if not rows:
         print("No logs found for this agent.")
     else:
-        for row in reversed(rows): # Print in chronological order
+        for row in rows:
             print(f"[{row[0]}] [{row[1]}] {row[2]}")
             
     conn.close()
@@ -1,13 +1,40 @@
+import atexit
 import sys
+import threading
 from database import log_event
 from core.window_manager import get_window_manager
 
+# One manager per process: bursts of spawns (the dashboard, scripted CLI
+# loops) reuse its availability check, tmux control client and event thread
+# instead of starting and leaking a new set for every agent
+_manager = None
+_manager_lock = threading.Lock()
+
+def _get_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = get_window_manager()
+            atexit.register(_close_manager)
+        return _manager
+
+def _close_manager():
+    global _manager
+    manager, _manager = _manager, None
+    if manager is None:
+        return
+    # deliver queued agent.spawn events before the process exits
+    if hasattr(manager, "flush_events"):
+        manager.flush_events()
+    if hasattr(manager, "close"):
+        manager.close()
+
 def spawn_agent(name: str, goal: str) -> bool:
     """
     Spawns an agent in a new window/pane using the WindowManager.
     """
     try:
-        manager = get_window_manager()
+        manager = _get_manager()
         log_event(name, "Window manager initialized.", "SPAWN")
 
         # Ensure the session/environment is ready
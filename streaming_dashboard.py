@@ -29,7 +29,9 @@ class StreamControl(App):
 
     def __init__(self):
         super().__init__()
+        # db_lock serializes use of the one connection opened in on_mount
         self.db_lock = threading.Lock()
+        self.db = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -67,7 +69,28 @@ class StreamControl(App):
                         yield Button("Use Selected", id="use_device")
         yield Footer()
 
+    def _open_db(self) -> sqlite3.Connection:
+        # One connection for the app's lifetime, schema checked once here
+        # instead of a connect + CREATE TABLE on every refresh and command
+        conn = sqlite3.connect(DB_NAME, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS streams(
+                    name TEXT PRIMARY KEY,
+                    input TEXT,
+                    url TEXT,
+                    vbit TEXT,
+                    abit TEXT,
+                    status TEXT,
+                    last_update TIMESTAMP
+                )
+            """)
+        return conn
+
     def on_mount(self) -> None:
+        self.db = self._open_db()
         dt = self.query_one('#table', DataTable)
         dt.add_columns("Name", "Input", "URL", "VBit", "ABit", "Status", "Updated")
         dev = self.query_one('#devices', DataTable)
@@ -76,27 +99,19 @@ class StreamControl(App):
         self.refresh_streams()
         self._scan_devices()
 
+    def on_unmount(self) -> None:
+        with self.db_lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
     def refresh_streams(self) -> None:
         try:
             dt = self.query_one('#table', DataTable)
             
             if self.db_lock.acquire(timeout=0.5):
                 try:
-                    conn = sqlite3.connect(DB_NAME, timeout=10)
-                    c = conn.cursor()
-                    c.execute("""
-                        CREATE TABLE IF NOT EXISTS streams(
-                            name TEXT PRIMARY KEY,
-                            input TEXT,
-                            url TEXT,
-                            vbit TEXT,
-                            abit TEXT,
-                            status TEXT,
-                            last_update TIMESTAMP
-                        )
-                    """)
-                    rows = c.execute("SELECT name,input,url,vbit,abit,status,last_update FROM streams ORDER BY name").fetchall()
-                    conn.close()
+                    rows = self.db.execute("SELECT name,input,url,vbit,abit,status,last_update FROM streams ORDER BY name").fetchall()
                 finally:
                     self.db_lock.release()
             else:
@@ -182,22 +197,14 @@ class StreamControl(App):
 
         if self.db_lock.acquire(timeout=1):
             try:
-                conn = sqlite3.connect(DB_NAME, timeout=10)
-                c = conn.cursor()
-                c.execute("""
-                    CREATE TABLE IF NOT EXISTS streams(
-                        name TEXT PRIMARY KEY, input TEXT, url TEXT, vbit TEXT, abit TEXT, status TEXT, last_update TIMESTAMP
-                    )
-                """)
                 status = {
                     "START": "START_REQUESTED",
                     "STOP": "STOP_REQUESTED",
                     "UPDATE": "UPDATE_REQUESTED",
                 }.get(cmd, "REQUESTED")
-                c.execute("INSERT OR REPLACE INTO streams(name,input,url,vbit,abit,status,last_update) VALUES(?,?,?,?,?,?,?)",
-                          (name, inp, url, vbit, abit, status, datetime.now()))
-                conn.commit()
-                conn.close()
+                with self.db:
+                    self.db.execute("INSERT OR REPLACE INTO streams(name,input,url,vbit,abit,status,last_update) VALUES(?,?,?,?,?,?,?)",
+                                    (name, inp, url, vbit, abit, status, datetime.now()))
             finally:
                 self.db_lock.release()
         else:
@@ -214,18 +221,14 @@ class StreamControl(App):
         try:
             if self.db_lock.acquire(timeout=1):
                 try:
-                    conn = sqlite3.connect(DB_NAME, timeout=10)
-                    c = conn.cursor()
-                    row = c.execute("SELECT input, url, vbit, abit FROM streams WHERE name=?", (name,)).fetchone()
+                    row = self.db.execute("SELECT input, url, vbit, abit FROM streams WHERE name=?", (name,)).fetchone()
                     if not row:
                         self.notify(f"Stream '{name}' not found in database.", severity="error")
-                        conn.close()
                         return
                     
                     inp, url, vbit, abit = row
-                    c.execute("UPDATE streams SET status=?, last_update=? WHERE name=?", ("STOP_REQUESTED", datetime.now(), name))
-                    conn.commit()
-                    conn.close()
+                    with self.db:
+                        self.db.execute("UPDATE streams SET status=?, last_update=? WHERE name=?", ("STOP_REQUESTED", datetime.now(), name))
                 finally:
                     self.db_lock.release()
             else:
@@ -272,11 +275,8 @@ class StreamControl(App):
             # Delete from database
             if self.db_lock.acquire(timeout=1):
                 try:
-                    conn = sqlite3.connect(DB_NAME, timeout=10)
-                    c = conn.cursor()
-                    c.execute("DELETE FROM streams WHERE name=?", (name_to_close,))
-                    conn.commit()
-                    conn.close()
+                    with self.db:
+                        self.db.execute("DELETE FROM streams WHERE name=?", (name_to_close,))
                 finally:
                     self.db_lock.release()
             else:
@@ -428,17 +428,12 @@ class StreamControl(App):
         try:
             if self.db_lock.acquire(timeout=1):
                 try:
-                    conn = sqlite3.connect(DB_NAME, timeout=10)
-                    c = conn.cursor()
-                    c.execute("CREATE TABLE IF NOT EXISTS streams(name TEXT PRIMARY KEY, input TEXT, url TEXT, vbit TEXT, abit TEXT, status TEXT, last_update TIMESTAMP)")
-                    rows = c.execute("SELECT name,input,url,vbit,abit FROM streams WHERE COALESCE(status,'') NOT LIKE 'STOP%' ").fetchall()
-                    
-                    for name, inp, url, vbit, abit in rows:
-                        c.execute("UPDATE streams SET status=?, last_update=? WHERE name=?", ("STOP_REQUESTED", datetime.now(), name))
-                        log_event("ControlCenter", f"[P2] STREAM_CMD STOP {name} input=\"{inp}\" url={url} vbit={vbit} abit={abit}", "TASK")
-                    
-                    conn.commit()
-                    conn.close()
+                    with self.db:
+                        rows = self.db.execute("SELECT name,input,url,vbit,abit FROM streams WHERE COALESCE(status,'') NOT LIKE 'STOP%' ").fetchall()
+                        
+                        for name, inp, url, vbit, abit in rows:
+                            self.db.execute("UPDATE streams SET status=?, last_update=? WHERE name=?", ("STOP_REQUESTED", datetime.now(), name))
+                            log_event("ControlCenter", f"[P2] STREAM_CMD STOP {name} input=\"{inp}\" url={url} vbit={vbit} abit={abit}", "TASK")
                 finally:
                     self.db_lock.release()
             else:
@@ -13,11 +13,9 @@ def mock_docker_client():
         # Mock client.images.pull
         mock_client_instance.images.pull.return_value = None # pull doesn't return anything specific
         
-        # Mock client.containers.run
-        mock_container_run_result = MagicMock()
-        mock_container_run_result.id = "test_container_id"
-        mock_container_run_result.top.return_value = {'Processes': [['root', '1234', '0.0', '0.0', '0', '0', '?', 'Ss', '0:00', 'sleep 10']]}
-        mock_client_instance.containers.run.return_value = mock_container_run_result
+        # Mock the low-level API used on the create path
+        mock_client_instance.api.create_container.return_value = {"Id": "test_container_id"}
+        mock_client_instance.api.top.return_value = {'Processes': [['root', '1234', '0.0', '0.0', '0', '0', '?', 'Ss', '0:00', 'sleep 10']]}
 
         # Mock client.containers.get
         mock_container_get_result = MagicMock()
@@ -55,22 +53,29 @@ class TestDockerSandbox:
             config={"image": "ubuntu:latest"}
         )
         
-        mock_client_instance.images.pull.assert_called_once_with("ubuntu:latest")
-        mock_client_instance.containers.run.assert_called_once_with(
+        mock_client_instance.images.get.assert_called_once_with("ubuntu:latest")
+        mock_client_instance.images.pull.assert_not_called()
+        mock_client_instance.api.create_container.assert_called_once_with(
             "ubuntu:latest",
             command="sleep 10",
-            name="liku-agent-test-session",
-            detach=True,
+            name=resource.details["container_name"],
             tty=True,
-            stdin_open=True
+            stdin_open=True,
+            volumes=['/app'],
+            working_dir='/app',
+            host_config=mock_client_instance.api.create_host_config.return_value
         )
+        mock_client_instance.api.start.assert_called_once_with("test_container_id")
         assert isinstance(resource, SandboxResource)
         assert resource.id == "test_container_id"
-        assert resource.pid == "1234"
+        assert resource.pid == 1234
+        assert resource.details["container_name"].startswith("liku-agent-test-session-")
+        mock_client_instance.api.top.assert_called_once_with("test_container_id")
 
     def test_create_container_image_not_found(self, docker_sandbox, mock_docker_client):
         """Test container creation fails if image not found."""
         mock_from_env, mock_client_instance = mock_docker_client
+        mock_client_instance.images.get.side_effect = ImageNotFound("Image not found")
         mock_client_instance.images.pull.side_effect = ImageNotFound("Image not found")
         
         with pytest.raises(ImageNotFound):
@@ -81,7 +86,39 @@ class TestDockerSandbox:
                 config={"image": "nonexistent-image"}
             )
         mock_client_instance.images.pull.assert_called_once_with("nonexistent-image")
-        mock_client_instance.containers.run.assert_not_called()
+        mock_client_instance.api.create_container.assert_not_called()
+
+    def test_create_pulls_missing_image_once(self, docker_sandbox, mock_docker_client):
+        """Test that a missing image is pulled, and later creates skip the local lookup."""
+        mock_from_env, mock_client_instance = mock_docker_client
+        mock_client_instance.images.get.side_effect = ImageNotFound("Image not found")
+
+        for session_key in ("s1", "s2"):
+            docker_sandbox.create(
+                agent_name="test-agent",
+                session_key=session_key,
+                command="sleep 10",
+                config={"image": "ubuntu:latest"}
+            )
+
+        mock_client_instance.images.get.assert_called_once_with("ubuntu:latest")
+        mock_client_instance.images.pull.assert_called_once_with("ubuntu:latest")
+
+    def test_create_repulls_image_removed_after_caching(self, docker_sandbox, mock_docker_client):
+        """Test that an image removed since it was cached is pulled again and the create retried once."""
+        mock_from_env, mock_client_instance = mock_docker_client
+        docker_sandbox.create(agent_name="test-agent", session_key="s1", command="sleep 10", config={})
+
+        mock_client_instance.images.get.side_effect = ImageNotFound("Image not found")
+        mock_client_instance.api.create_container.side_effect = [
+            ImageNotFound("No such image"),
+            {"Id": "retried_container_id"},
+        ]
+        resource = docker_sandbox.create(agent_name="test-agent", session_key="s2", command="sleep 10", config={})
+
+        assert resource.id == "retried_container_id"
+        mock_client_instance.images.pull.assert_called_once_with("ubuntu:latest")
+        assert mock_client_instance.api.create_container.call_count == 3
 
     def test_execute_command_success(self, docker_sandbox, mock_docker_client):
         """Test successful command execution inside a container."""
@@ -112,6 +149,15 @@ class TestDockerSandbox:
         
         assert "Error (exit code 1): error output\nstdout" in output
 
+    def test_execute_command_binary_output(self, docker_sandbox, mock_docker_client):
+        """Test that undecodable output is replaced instead of failing the call."""
+        mock_from_env, mock_client_instance = mock_docker_client
+        mock_client_instance.containers.get.return_value.exec_run.return_value = (0, (b"ok \xff", None))
+
+        output = docker_sandbox.execute("test_container_id", "cat /bin/true")
+
+        assert output == "ok \ufffd"
+
     def test_execute_container_not_found(self, docker_sandbox, mock_docker_client):
         """Test command execution fails if container not found."""
         mock_from_env, mock_client_instance = mock_docker_client
@@ -150,6 +196,15 @@ class TestDockerSandbox:
         mock_client_instance.containers.get.return_value.logs.assert_called_once_with(tail=10, stream=False)
         assert output == "container logs\nline2"
 
+    def test_capture_output_bytes_skips_decode(self, docker_sandbox, mock_docker_client):
+        """Test that raw output capture returns the container log bytes unchanged."""
+        mock_from_env, mock_client_instance = mock_docker_client
+
+        output = docker_sandbox.capture_output_bytes("test_container_id", lines=10)
+
+        mock_client_instance.containers.get.return_value.logs.assert_called_once_with(tail=10, stream=False)
+        assert output == b"container logs\nline2"
+
     def test_capture_output_container_not_found(self, docker_sandbox, mock_docker_client):
         """Test output capture fails if container not found."""
         mock_from_env, mock_client_instance = mock_docker_client
@@ -162,8 +217,8 @@ class TestDockerSandbox:
     def test_create_container_no_pid(self, docker_sandbox, mock_docker_client):
         """Test container creation when top() returns no processes."""
         mock_from_env, mock_client_instance = mock_docker_client
-        mock_client_instance.containers.run.return_value.id = "test_container_id_no_pid"
-        mock_client_instance.containers.run.return_value.top.return_value = {'Processes': []} # No processes
+        mock_client_instance.api.create_container.return_value = {"Id": "test_container_id_no_pid"}
+        mock_client_instance.api.top.return_value = {'Processes': []} # No processes
         
         resource = docker_sandbox.create(
             agent_name="test-agent",
@@ -175,3 +230,18 @@ class TestDockerSandbox:
         assert isinstance(resource, SandboxResource)
         assert resource.id == "test_container_id_no_pid"
         assert resource.pid is None
+
+    def test_create_container_top_fails(self, docker_sandbox, mock_docker_client):
+        """Test container creation still succeeds when top() races container startup."""
+        mock_from_env, mock_client_instance = mock_docker_client
+        mock_client_instance.api.top.side_effect = APIError("not running")
+
+        resource = docker_sandbox.create(
+            agent_name="test-agent",
+            session_key="test-session",
+            command="sleep 10",
+            config={"image": "ubuntu:latest"}
+        )
+
+        assert resource.id == "test_container_id"
+        assert resource.pid is None
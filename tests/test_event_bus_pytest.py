@@ -105,6 +105,36 @@ class TestEventBusEmit:
         captured = capsys.readouterr()
         assert "Warning: Could not log event to database" in captured.out
 
+    def test_emit_coalesces_database_writes(self, events_dir, mocker):
+        """Test that coalesce=True batches database writes into log_events()."""
+        mock_db = MagicMock()
+        mocker.patch('event_bus.StateBackend', return_value=mock_db)
+
+        bus = EventBus(events_dir=events_dir, db_path="dummy_path", coalesce=True, flush_interval=10)
+        bus.emit("test.one", {"n": 1}, session_key="s1", agent_name="a1")
+        bus.emit("test.two", {"n": 2})
+        bus.close()
+
+        mock_db.log_event.assert_not_called()
+        written = [row for call in mock_db.log_events.call_args_list for row in call.args[0]]
+        assert written == [
+            ("test.one", {"n": 1}, "s1", "a1"),
+            ("test.two", {"n": 2}, None, None),
+        ]
+
+    def test_emit_after_close_writes_synchronously(self, events_dir, mocker):
+        """Test that events emitted after close() are not queued and lost."""
+        mock_db = MagicMock()
+        mocker.patch('event_bus.StateBackend', return_value=mock_db)
+
+        bus = EventBus(events_dir=events_dir, db_path="dummy_path", coalesce=True, batch_size=1)
+        bus.close()
+        for n in range(bus._max_pending + 1):
+            bus.emit("test.late", {"n": n})
+
+        assert mock_db.log_event.call_count == bus._max_pending + 1
+        assert not bus._event_queue
+
 
 class TestEventBusGet:
     """Tests for get_recent_events()."""
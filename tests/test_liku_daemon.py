@@ -3,8 +3,12 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 import json
 import os
+import selectors
+import socket
+import struct
+import threading
 
-from liku.liku_daemon import LikuDaemon
+from liku.liku_daemon import LikuDaemon, RawResponse, _PendingRequest, _send_frame, _supports_seqpacket
 from liku.sandbox.base import SandboxResource
 
 @pytest.fixture
@@ -73,6 +77,16 @@ def test_init_configures_unix(tmp_path, mocker):
     del os.environ["LIKU_USE_TCP"]
     del os.environ["LIKU_SOCKET_PATH"]
 
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT not supported")
+def test_configure_scale_out_sets_reuseport(mock_daemon):
+    """Test that multi-process mode lets listeners share the TCP port."""
+    sock = mock_daemon._create_listener(socket.AF_INET)
+    try:
+        mock_daemon._configure_scale_out(sock)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT) == 1
+    finally:
+        sock.close()
+
 def test_process_request_no_action(mock_daemon):
     """Test that a request with no action returns an error."""
     request = {"params": "some_value"}
@@ -94,6 +108,12 @@ def test_ping_action(mock_daemon):
     assert response["status"] == "ok"
     assert response["message"] == "pong"
 
+def test_constant_responses_are_pre_encoded(mock_daemon):
+    """Test that constant and error responses carry an encoding matching their fields."""
+    for request in ({"action": "ping"}, {}, {"action": "kill_pane"}, {"action": 'we"ird\n'}):
+        response = mock_daemon._process_request(request)
+        assert json.loads(response.encoded) == response
+
 # === Event Bus Handlers ===
 
 def test_emit_event_action(mock_daemon):
@@ -258,6 +278,34 @@ def test_list_panes_action(mock_daemon):
     assert len(response["panes"]) == 1
     assert response["panes"][0]["pane_id"] == "%2"
 
+def test_tmux_sandbox_is_shared(mock_daemon):
+    """Test that listings reuse one tmux sandbox and lend its manager to the factory."""
+    import liku.liku_daemon as daemon_module
+    daemon_module.SandboxFactory.mode_for.return_value = "tmux"
+    mock_daemon.state_backend.get_agent_session_by_pane_id.return_value = None
+
+    mock_daemon._process_request({"action": "list_panes", "session": "a"})
+    mock_daemon._process_request({"action": "list_panes", "session": "b"})
+    mock_daemon._process_request({"action": "kill_pane", "pane_id": "%1"})
+
+    daemon_module.TmuxSandbox.assert_called_once()
+    assert daemon_module.SandboxFactory.get_sandbox.call_args.kwargs["tmux_manager"] is mock_daemon.mock_tmux_sandbox.tmux_manager
+
+def test_list_panes_reuses_recent_listing(mock_daemon):
+    """Test that repeated listings within the TTL skip tmux until a pane changes."""
+    mock_daemon.mock_tmux_sandbox.tmux_manager.list_panes.return_value = []
+    mock_daemon.state_backend.get_agent_session_by_pane_id.return_value = None
+    request = {"action": "list_panes", "session": "main"}
+
+    first = mock_daemon._process_request(request)
+    second = mock_daemon._process_request(request)
+    assert second is first
+    assert mock_daemon.mock_tmux_sandbox.tmux_manager.list_panes.call_count == 1
+
+    mock_daemon._process_request({"action": "kill_pane", "pane_id": "%2"})
+    mock_daemon._process_request(request)
+    assert mock_daemon.mock_tmux_sandbox.tmux_manager.list_panes.call_count == 2
+
 def test_send_keys_action(mock_daemon):
     """Test the 'send_keys' action with an allowed command."""
     # The 'test-agent' in the default config can run 'pytest'
@@ -288,6 +336,90 @@ def test_capture_pane_action(mock_daemon):
     assert response["status"] == "ok"
     assert response["output"] == "some output"
 
+def test_capture_pane_raw_action(mock_daemon):
+    """Test the 'capture_pane_raw' action returns an unescaped byte body."""
+    request = {"action": "capture_pane_raw", "pane_id": "%4", "start": -10}
+    mock_daemon.state_backend.get_agent_session_by_pane_id.return_value = None
+    mock_daemon.mock_sandbox.capture_output_bytes.return_value = b'line "1"\nline 2'
+
+    response = mock_daemon._process_request(request)
+
+    mock_daemon.mock_sandbox.capture_output_bytes.assert_called_once_with(resource_id="%4", lines=10)
+    assert response == RawResponse(b'line "1"\nline 2')
+
+def test_reactor_reads_length_prefixed_frames(mock_daemon):
+    """Test that the reactor reassembles a large request frame and answers it framed."""
+    server, client = socket.socketpair()
+    server.setblocking(False)
+    mock_daemon._selector.register(server, selectors.EVENT_READ, _PendingRequest(server))
+    server_fd = server.fileno()
+    payload = {"blob": "x" * 100000}
+    body = json.dumps({"action": "emit_event", "event_type": "big", "payload": payload}).encode()
+    mock_daemon.event_bus.emit.return_value = "/tmp/e.event"
+
+    with client:
+        sender = threading.Thread(target=client.sendall, args=(struct.pack(">I", len(body)) + body,))
+        sender.start()
+        while server_fd in mock_daemon._selector.get_map():
+            mock_daemon._run_once(1.0)
+        sender.join()
+
+        length, kind = struct.unpack(">IB", client.recv(5, socket.MSG_WAITALL))
+        response = json.loads(client.recv(length, socket.MSG_WAITALL))
+
+    assert kind == 0
+    assert response == {"status": "ok", "event_file": "/tmp/e.event"}
+    assert mock_daemon.event_bus.emit.call_args.kwargs["payload"] == payload
+
+@pytest.mark.skipif(not _supports_seqpacket(), reason="AF_UNIX SOCK_SEQPACKET not supported")
+def test_reactor_reads_seqpacket_messages(mock_daemon):
+    """Test that SOCK_SEQPACKET connections exchange unprefixed messages."""
+    mock_daemon.seqpacket = True
+    server, client = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    server.setblocking(False)
+    mock_daemon._selector.register(server, selectors.EVENT_READ, _PendingRequest(server))
+    server_fd = server.fileno()
+
+    with client:
+        client.send(json.dumps({"action": "ping"}).encode())
+        while server_fd in mock_daemon._selector.get_map():
+            mock_daemon._run_once(1.0)
+
+        message = client.recv(4096)
+
+    assert message[0] == 0
+    assert json.loads(message[1:]) == {"status": "ok", "message": "pong"}
+
+@pytest.mark.skipif(not hasattr(socket.socket, "sendmsg"), reason="sendmsg not available")
+def test_send_frame_finishes_short_vectored_write():
+    """Test that a partial sendmsg of header and body is completed with sendall."""
+    sock = MagicMock()
+    sock.type = socket.SOCK_STREAM
+    sock.sendmsg.return_value = 7  # full 5-byte header plus 2 body bytes
+
+    _send_frame(sock, b"abcdef")
+
+    header = struct.pack(">IB", 6, 0)
+    sock.sendmsg.assert_called_once_with([header, b"abcdef"])
+    assert bytes(sock.sendall.call_args.args[0]) == b"cdef"
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="SO_PEERCRED not available")
+def test_peer_allowed_checks_uid(mock_daemon):
+    """Test that UNIX socket peers running as another user are rejected."""
+    sock = MagicMock()
+    sock.getsockopt.return_value = struct.pack("3i", 42, os.getuid(), os.getgid())
+    assert mock_daemon._peer_allowed(sock) is True
+
+    sock.getsockopt.return_value = struct.pack("3i", 42, os.getuid() + 1, os.getgid())
+    assert mock_daemon._peer_allowed(sock) is False
+
+def test_wake_interrupts_blocking_select(mock_daemon):
+    """Test that a wakeup returns a select() that has no timeout."""
+    waker = threading.Timer(0.05, mock_daemon._wake)
+    waker.start()
+    mock_daemon._run_once()  # Would block forever without the wakeup
+    waker.join()
+
 # === Error Condition Tests ===
 
 @pytest.mark.parametrize("action, params", [
@@ -7,10 +7,11 @@ import json
 import sqlite3
 import tempfile
 import unittest
+import unittest.mock
 from datetime import datetime
 from pathlib import Path
 
-from liku.state_backend import StateBackend
+from liku.state_backend import StateBackend, _dicts_from_cursor
 
 
 class StateBackendTests(unittest.TestCase):
@@ -25,7 +26,7 @@ class StateBackendTests(unittest.TestCase):
     def tearDown(self):
         """Clean up test fixtures."""
         if hasattr(self, 'backend'):
-            self.backend.close()
+            self.backend.close_all_connections()
     
     def test_database_initialization(self):
         """Test database is initialized with correct schema."""
@@ -54,6 +55,85 @@ class StateBackendTests(unittest.TestCase):
         self.assertEqual(mode.lower(), 'wal')
         conn.close()
     
+    def test_schema_version_in_header(self):
+        """Test the schema version is stored in PRAGMA user_version."""
+        conn = sqlite3.connect(str(self.db_path))
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        
+        self.assertEqual(version, StateBackend.CURRENT_SCHEMA_VERSION)
+    
+    def test_legacy_schema_version_backfilled(self):
+        """Test a database versioned only by schema_version is not re-migrated."""
+        self.backend.close_all_connections()
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("PRAGMA user_version = 0")
+        conn.execute("DELETE FROM schema_version WHERE version > 1")
+        conn.commit()
+        conn.close()
+        
+        with unittest.mock.patch.object(StateBackend, '_migrate_to_v1') as migrate:
+            self.backend = StateBackend(str(self.db_path))
+        
+        # Only the migrations after the recorded version run
+        migrate.assert_not_called()
+        conn = sqlite3.connect(str(self.db_path))
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        self.assertEqual(version, StateBackend.CURRENT_SCHEMA_VERSION)
+    
+    def test_concurrent_initialization_migrates_once(self):
+        """Test backends racing on a new database apply each migration once."""
+        import threading
+        
+        db_path = str(Path(self.temp_dir) / "race.db")
+        errors = []
+        backends = []
+        
+        def open_backend():
+            try:
+                backends.append(StateBackend(db_path))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+        
+        threads = [threading.Thread(target=open_backend) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for backend in backends:
+            backend.close_all_connections()
+        
+        self.assertEqual(errors, [])
+        conn = sqlite3.connect(db_path)
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        conn.close()
+        self.assertEqual(versions, list(range(1, StateBackend.CURRENT_SCHEMA_VERSION + 1)))
+    
+    def test_filtered_events_use_compound_index(self):
+        """Test type+session event queries are planned on the compound index."""
+        conn = self.backend._get_connection()
+        plan = " ".join(
+            row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + StateBackend._SQL_EVENTS_BY_TYPE_SESSION,
+                ("agent.spawn", "s1", 10)
+            )
+        )
+        
+        self.assertIn("idx_event_type_session_created", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+    
+    def test_connection_pragmas(self):
+        """Test backend connections carry the tuning PRAGMAs."""
+        conn = self.backend._get_connection()
+        pragma = lambda name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+        
+        self.assertEqual(pragma("cache_size"), -65536)
+        self.assertEqual(pragma("temp_store"), 2)
+        self.assertEqual(pragma("journal_size_limit"), 6144000)
+        self.assertEqual(pragma("foreign_keys"), 1)
+        self.assertGreaterEqual(pragma("busy_timeout"), 5000)
+    
     def test_start_session(self):
         """Test creating an agent session."""
         # create_agent_session requires session_key parameter
@@ -124,6 +204,155 @@ class StateBackendTests(unittest.TestCase):
         self.assertEqual(events[0]["event_type"], "agent.spawn")
         self.assertEqual(events[0]["payload"]["agent"], "test-agent")
     
+    def test_log_events_batch(self):
+        """Test logging a batch of events in one call."""
+        written = self.backend.log_events([
+            ("agent.spawn", {"num": 1}, "s1", "agent-a"),
+            ("agent.kill", {"num": 2}, "s1", None),
+        ])
+        
+        self.assertEqual(len(written), 2)
+        events = self.backend.get_events()
+        self.assertEqual(len(events), 2)
+        self.assertEqual({e["payload"]["num"] for e in events}, {1, 2})
+    
+    def test_event_payload_stored_as_blob(self):
+        """Test payloads are stored as JSON bytes and legacy TEXT rows still decode."""
+        self.backend.log_event("test.blob", {"num": 1})
+        with self.backend._transaction() as conn:
+            conn.execute(
+                "INSERT INTO event_log (event_type, payload) VALUES (?, ?)",
+                ("test.text", json.dumps({"num": 2}))
+            )
+        
+        conn = self.backend._get_connection()
+        types = {row[0]: row[1] for row in conn.execute(
+            "SELECT event_type, typeof(payload) FROM event_log"
+        )}
+        self.assertEqual(types, {"test.blob": "blob", "test.text": "text"})
+        payloads = {e["event_type"]: e["payload"] for e in self.backend.get_events()}
+        self.assertEqual(payloads, {"test.blob": {"num": 1}, "test.text": {"num": 2}})
+    
+    def test_upserts_return_existing_id(self):
+        """Test the update path of an upsert returns the existing row id."""
+        session_id = self.backend.create_agent_session("agent", "s1")
+        pane_id = self.backend.record_pane("s1", "%1")
+        # Inserts elsewhere move the connection's last_insert_rowid
+        self.backend.log_event("test.event", {"num": 1})
+        self.backend.create_agent_session("other", "s2")
+        self.backend.record_pane("s2", "%2")
+        
+        self.assertEqual(self.backend.create_agent_session("agent", "s1", pid=42), session_id)
+        self.assertEqual(self.backend.record_pane("s1", "%1", status="busy"), pane_id)
+    
+    def test_lookup_caches_invalidated_by_writes(self):
+        """Test approval/pane lookups are cached until this backend writes them."""
+        self.backend.set_approval_mode("agent", "auto")
+        self.backend.record_pane("s1", "%1", status="idle")
+        self.assertEqual(self.backend.get_approval_mode("agent"), "auto")
+        self.assertEqual(self.backend.get_pane("%1")["status"], "idle")
+        
+        # An out-of-band change is hidden by the cache...
+        with self.backend._transaction() as conn:
+            conn.execute("UPDATE approval_settings SET mode = 'deny'")
+        self.assertEqual(self.backend.get_approval_mode("agent"), "auto")
+        
+        # ...but writes through the backend are seen at once
+        self.backend.set_approval_mode("agent", "ask")
+        self.backend.record_pane("s1", "%1", status="busy")
+        self.assertEqual(self.backend.get_approval_mode("agent"), "ask")
+        self.assertEqual(self.backend.get_pane("%1")["status"], "busy")
+    
+    def test_lookup_cache_skips_read_raced_by_write(self):
+        """Test a read that started before a write does not cache the old row."""
+        self.backend.set_approval_mode("agent", "auto")
+        conn = self.backend._get_connection()
+        
+        class RacingConnection:
+            def execute(inner, sql, params):
+                cursor = conn.execute(sql, params)
+                self.backend.set_approval_mode("agent", "deny")
+                return cursor
+        
+        with unittest.mock.patch.object(self.backend, "_get_connection", return_value=RacingConnection()):
+            self.assertEqual(self.backend.get_approval_mode("agent"), "auto")
+        
+        self.assertEqual(self.backend.get_approval_mode("agent"), "deny")
+    
+    def test_dicts_from_cursor_across_batches(self):
+        """Test rows spanning several fetchmany() batches all become dicts."""
+        for i in range(5):
+            self.backend.record_pane("s1", f"%{i}", pane_index=i)
+        
+        conn = self.backend._get_connection()
+        cursor = conn.execute("SELECT terminal_id, pane_index FROM tmux_pane ORDER BY pane_index")
+        rows = _dicts_from_cursor(cursor, size=2)
+        
+        self.assertEqual(rows, [{"terminal_id": f"%{i}", "pane_index": i} for i in range(5)])
+    
+    def test_log_events_returns_ids_in_order(self):
+        """Test batches spanning several INSERT chunks return every id in order."""
+        count = StateBackend.EVENT_INSERT_CHUNK * 2 + 5
+        ids = self.backend.log_events([("test.event", {"num": i}, None, None) for i in range(count)])
+        
+        self.assertEqual(len(ids), count)
+        self.assertEqual(ids, sorted(set(ids)))
+        conn = self.backend._get_connection()
+        nums = dict(conn.execute("SELECT id, json_extract(CAST(payload AS TEXT), '$.num') FROM event_log"))
+        self.assertEqual([nums[i] for i in ids], list(range(count)))
+    
+    def test_log_events_share_batch_timestamp(self):
+        """Test a batch binds one created_at in CURRENT_TIMESTAMP's format."""
+        self.backend.log_events([("test.event", {"num": i}, None, None) for i in range(3)])
+        
+        conn = self.backend._get_connection()
+        stamps = {row[0] for row in conn.execute("SELECT created_at FROM event_log")}
+        self.assertEqual(len(stamps), 1)
+        stamp = datetime.strptime(stamps.pop(), "%Y-%m-%d %H:%M:%S.%f")
+        # Same clock and format as the rows SQLite timestamps itself
+        now = datetime.strptime(conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0], "%Y-%m-%d %H:%M:%S")
+        self.assertLess(abs((now - stamp).total_seconds()), 60)
+    
+    def test_get_events_projects_fields(self):
+        """Test fields= returns only the requested payload keys."""
+        self.backend.log_event("agent.spawn", {"num": 1, "big": "x" * 1000, "a.b": [1]}, "s1")
+        self.backend.log_event("agent.kill", {"other": True}, "s1")
+        
+        events = self.backend.get_events(event_type="agent.spawn", fields=["num", "a.b"])
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["payload"], {"num": 1, "a.b": [1]})
+        self.assertEqual(events[0]["session_key"], "s1")
+        
+        events = self.backend.get_events(session_key="s1", fields=["num"])
+        self.assertCountEqual([e["payload"] for e in events], [{"num": 1}, {"num": None}])
+        
+        # JSON booleans keep their type instead of coming back as 0/1
+        events = self.backend.get_events(event_type="agent.kill", fields=["other"])
+        self.assertIs(events[0]["payload"]["other"], True)
+    
+    def test_get_events_projects_fields_without_json_arrow(self):
+        """Test fields= is applied in Python on SQLite older than 3.38."""
+        self.backend.log_event("agent.spawn", {"num": 1, "ok": False, "big": "x" * 1000}, "s1")
+        self.backend.log_event("agent.kill", ["not", "an", "object"], "s1")
+        
+        with unittest.mock.patch("liku.state_backend._JSON_ARROW", False):
+            events = self.backend.get_events(session_key="s1", fields=["num", "ok"])
+        self.assertCountEqual(
+            [e["payload"] for e in events],
+            [{"num": 1, "ok": False}, {"num": None, "ok": None}]
+        )
+    
+    def test_log_events_batch_is_atomic(self):
+        """Test a failing row rolls back the whole batch."""
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.backend.log_events([
+                ("agent.spawn", {"num": 1}, "s1", None),
+                (None, {"num": 2}, "s1", None),
+            ])
+        
+        self.assertEqual(self.backend.get_events(), [])
+        self.assertFalse(self.backend._get_writer_connection().in_transaction)
+    
     def test_get_events_with_filter(self):
         """Test filtering events by type."""
         session_key = "test-agent-12345"
@@ -284,6 +513,68 @@ class StateBackendTests(unittest.TestCase):
         self.assertEqual(len(sessions), 10)
         self.assertEqual(len(events), 10)
 
+    
+    def test_connection_reused_per_thread(self):
+        """Test each thread keeps one connection and close_all reaches them all."""
+        import threading
+        
+        conn = self.backend._get_connection()
+        self.assertIs(self.backend._get_connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)
+        
+        thread = threading.Thread(target=self.backend.warm_connection)
+        thread.start()
+        thread.join()
+        # The shared writer plus one reader per thread
+        self.assertEqual(len(self.backend._connections), 3)
+        
+        self.backend.close_all_connections()
+        self.assertEqual(self.backend._connections, [])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        # A fresh connection is opened on next use
+        self.assertIsNot(self.backend._get_connection(), conn)
+
+    def test_other_threads_reopen_after_close_all(self):
+        """Test a thread warmed before close_all_connections() can still read."""
+        import queue
+        import threading
+
+        requests, results = queue.Queue(), queue.Queue()
+        warmed = threading.Event()
+
+        def worker():
+            self.backend.warm_connection()
+            warmed.set()
+            while requests.get():
+                try:
+                    results.put(self.backend.get_events())
+                except Exception as e:
+                    results.put(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        warmed.wait(timeout=5)
+        self.backend.close_all_connections()
+        self.backend.log_event("test.event", {"num": 1})
+        requests.put(True)
+        requests.put(False)
+        thread.join()
+
+        result = results.get()
+        self.assertNotIsInstance(result, Exception)
+        self.assertEqual(len(result), 1)
+
+    def test_reads_use_read_only_connection(self):
+        """Test read connections reject writes while the writer commits them."""
+        conn = self.backend._get_connection()
+        self.assertIsNot(conn, self.backend._get_writer_connection())
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM event_log")
+        
+        self.backend.log_event("test.event", {"num": 1})
+        self.assertEqual(len(self.backend.get_events()), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
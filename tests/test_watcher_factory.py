@@ -3,12 +3,15 @@
 Unit tests for the WatcherFactory module.
 """
 
+import asyncio
+import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from watcher_factory import Debouncer, WatchCommand, WatcherFactory, WatcherNotAvailable
+from watcher_factory import Debouncer, InotifyWatcher, WatchCommand, WatcherFactory, WatcherNotAvailable
 
 
 class DebouncerTests(unittest.TestCase):
@@ -31,6 +34,35 @@ class DebouncerTests(unittest.TestCase):
         self.assertTrue(debouncer.should_emit("/path/file1.txt", "modified"))
         self.assertTrue(debouncer.should_emit("/path/file2.txt", "modified"))
     
+    def test_window_uses_monotonic_clock(self):
+        """Events are re-emitted once the window passes, regardless of wall-clock jumps."""
+        debouncer = Debouncer(window=0.5)
+        with patch("time.monotonic_ns", return_value=10_000_000_000), \
+             patch("time.time", return_value=0.0):
+            self.assertTrue(debouncer.should_emit("/path/file.txt", "modified"))
+        with patch("time.monotonic_ns", return_value=10_400_000_000), \
+             patch("time.time", return_value=1e9):
+            self.assertFalse(debouncer.should_emit("/path/file.txt", "modified"))
+        with patch("time.monotonic_ns", return_value=10_500_000_000):
+            self.assertTrue(debouncer.should_emit("/path/file.txt", "modified"))
+    
+    def test_memory_is_bounded(self):
+        """The least recently seen keys are evicted and stale ones swept."""
+        debouncer = Debouncer(window=0.5, max_entries=2)
+        debouncer.should_emit("/a", "modified")
+        debouncer.should_emit("/b", "modified")
+        debouncer.should_emit("/a", "modified")  # debounced, but refreshes /a
+        debouncer.should_emit("/c", "modified")
+        self.assertEqual(list(debouncer._last_events), [("/a", "modified"), ("/c", "modified")])
+        
+        debouncer = Debouncer(window=0.5)
+        with patch("time.monotonic_ns", return_value=0):
+            debouncer.should_emit("/old", "modified")
+        with patch("time.monotonic_ns", return_value=6_000_000_000):
+            for i in range(Debouncer.SWEEP_INTERVAL):
+                debouncer.should_emit(f"/new{i}", "modified")
+        self.assertNotIn(("/old", "modified"), debouncer._last_events)
+    
     def test_reset_clears_state(self):
         """Reset should clear debouncer state."""
         debouncer = Debouncer(window=0.5)
@@ -88,6 +120,47 @@ class WatcherFactoryTests(unittest.TestCase):
             cmd = factory.build(tmpdir, recursive=True)
             self.assertIn("-r", cmd.args)
     
+    def test_files_are_watched_directly(self):
+        """Should pass file targets to the watcher instead of their parent."""
+        factory = WatcherFactory()
+        with patch("shutil.which", return_value="/usr/bin/inotifywait"), \
+             tempfile.TemporaryDirectory() as tmpdir:
+            
+            target = os.path.join(tmpdir, "state.json")
+            open(target, "w").close()
+            factory._system = "Linux"
+            cmd = factory.build_paths([target], recursive=False)
+            self.assertEqual(cmd.args[-1], target)
+            self.assertNotIn(tmpdir, cmd.args)
+    
+    def test_powershell_runs_shared_script_file(self):
+        """Should run one static .ps1 with -File, passing targets as arguments."""
+        factory = WatcherFactory()
+        with patch("shutil.which", return_value="powershell.exe"), \
+             tempfile.TemporaryDirectory() as tmpdir:
+            
+            factory._system = "Windows"
+            first = factory.build(tmpdir)
+            second = WatcherFactory()
+            second._system = "Windows"
+            again = second.build(tmpdir, recursive=False)
+            script = first.args[first.args.index("-File") + 1]
+            self.assertEqual(again.args[again.args.index("-File") + 1], script)
+            self.assertTrue(script.endswith(".ps1") and os.path.exists(script))
+            self.assertEqual(first.args[-2:], ["-Recursive", os.path.abspath(tmpdir)])
+            self.assertEqual(first.delimiter, '|')
+    
+    def test_runner_lookup_is_cached(self):
+        """Should resolve the runner on PATH once, not on every build."""
+        factory = WatcherFactory()
+        with patch("shutil.which", return_value="/usr/bin/inotifywait") as which, \
+             tempfile.TemporaryDirectory() as tmpdir:
+            
+            factory._system = "Linux"
+            factory.build(tmpdir)
+            factory.build(tmpdir)
+            which.assert_called_once_with("inotifywait")
+    
     def test_normalize_output_pipe_delimiter(self):
         """Should parse pipe-delimited output correctly."""
         factory = WatcherFactory()
@@ -97,6 +170,15 @@ class WatcherFactoryTests(unittest.TestCase):
         self.assertEqual(event.path, "/path/to/file.txt")
         self.assertEqual(event.kind, "modified")
     
+    def test_normalize_output_delimiter_in_path(self):
+        """Should keep a delimiter inside the path as part of the path."""
+        factory = WatcherFactory()
+        event = factory.normalize_output("/path/a|b.txt|modify", delimiter='|')
+        
+        self.assertIsNotNone(event)
+        self.assertEqual(event.path, "/path/a|b.txt")
+        self.assertEqual(event.kind, "modified")
+    
     def test_normalize_output_space_delimiter(self):
         """Should parse space-delimited output as fallback."""
         factory = WatcherFactory()
@@ -151,16 +233,16 @@ class IntegrationTests(unittest.TestCase):
     @patch("subprocess.Popen")
     def test_watch_yields_events(self, mock_popen):
         """Should yield events when watching a directory."""
-        factory = WatcherFactory()
+        factory = WatcherFactory(native=False)
         
         # Mock process with test output
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"/tmp/test.txt|MODIFY\0\n/tmp/test2.txt|CREATE\0\n")
+        os.close(write_fd)  # End of output
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            "/tmp/test.txt|modified\n",
-            "/tmp/test2.txt|created\n",
-            ""  # End of output
-        ]
+        mock_process.stdout.fileno.return_value = read_fd
         mock_popen.return_value = mock_process
+        self.addCleanup(os.close, read_fd)
         
         with patch("platform.system", return_value="Linux"), \
              patch("shutil.which", return_value="/usr/bin/inotifywait"), \
@@ -175,6 +257,152 @@ class IntegrationTests(unittest.TestCase):
             self.assertEqual(events[1].path, "/tmp/test2.txt")
             self.assertEqual(events[1].kind, "created")
 
+    
+    @patch("subprocess.Popen")
+    def test_watch_stats_each_path_once_per_batch(self, mock_popen):
+        """Should attach size/mtime from a single stat per path in a batch."""
+        factory = WatcherFactory(debounce_window=0, native=False)
+        
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             patch("shutil.which", return_value="/usr/bin/inotifywait"):
+            target = os.path.join(tmpdir, "data.txt")
+            with open(target, "w") as f:
+                f.write("12345")
+            
+            read_fd, write_fd = os.pipe()
+            record = f"{target}|MODIFY\0".encode()
+            os.write(write_fd, record * 3 + b"/missing/file|DELETE\0")
+            os.close(write_fd)
+            mock_process = MagicMock()
+            mock_process.stdout.fileno.return_value = read_fd
+            mock_popen.return_value = mock_process
+            self.addCleanup(os.close, read_fd)
+            
+            factory._system = "Linux"
+            with patch("os.stat", wraps=os.stat) as stat:
+                events = list(factory.watch(tmpdir))
+                stat_calls = [c.args[0] for c in stat.call_args_list]
+            
+            self.assertEqual([e.size for e in events], [5, 5, 5, -1])
+            self.assertEqual(events[0].mtime_ns, os.stat(target).st_mtime_ns)
+            self.assertEqual(stat_calls.count(target), 1)
+    
+    @patch("subprocess.Popen")
+    def test_awatch_reads_process_output(self, mock_popen):
+        """awatch() should yield the watcher's records from the event loop."""
+        factory = WatcherFactory(debounce_window=0, native=False)
+        
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"/tmp/x.txt|MODIFY\0\n/tmp/y.txt|DELETE\0\n")
+        os.close(write_fd)
+        mock_process = MagicMock()
+        mock_process.stdout.fileno.return_value = read_fd
+        mock_popen.return_value = mock_process
+        self.addCleanup(os.close, read_fd)
+        
+        async def collect(directory):
+            return [(e.path, e.kind) async for e in factory.awatch(directory)]
+        
+        with patch("shutil.which", return_value="/usr/bin/inotifywait"), \
+             tempfile.TemporaryDirectory() as tmpdir:
+            factory._system = "Linux"
+            events = asyncio.run(collect(tmpdir))
+        
+        self.assertEqual(events, [("/tmp/x.txt", "modified"), ("/tmp/y.txt", "deleted")])
+        mock_process.terminate.assert_called_once()
+    
+    def test_read_records_across_chunks(self):
+        """Should reassemble records split over reads and keep a trailing partial."""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"/tmp/a\xc3\xa9.txt\0/tmp/b.txt\0/tmp/c")
+        os.close(write_fd)
+        self.addCleanup(os.close, read_fd)
+        
+        records = list(WatcherFactory._read_records(read_fd, b"\0", read_size=3))
+        
+        self.assertEqual(records, [b"/tmp/a\xc3\xa9.txt", b"/tmp/b.txt", b"/tmp/c"])
+
+@unittest.skipUnless(InotifyWatcher.available(), "inotify not available")
+class InotifyWatcherTests(unittest.TestCase):
+    """Tests for the native Linux inotify watcher."""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmpdir = tmp.name
+    
+    def _watcher(self, recursive=True):
+        watcher = InotifyWatcher([self.tmpdir], recursive)
+        self.addCleanup(watcher.close)
+        return watcher
+    
+    def test_reports_file_changes(self):
+        """Should map create/modify/delete to standardized kinds."""
+        watcher = self._watcher()
+        target = os.path.join(self.tmpdir, "a.txt")
+        with open(target, "w") as f:
+            f.write("x")
+        os.remove(target)
+        
+        events = next(watcher.read_batches(window=0.05))
+        self.assertEqual(events, [(target, "created"), (target, "modified"), (target, "deleted")])
+    
+    def test_watches_new_subdirectories(self):
+        """Should pick up directories created after the watch started."""
+        watcher = self._watcher()
+        subdir = os.path.join(self.tmpdir, "sub")
+        os.mkdir(subdir)
+        batches = watcher.read_batches(window=0.05)
+        self.assertIn((subdir, "created"), next(batches))
+        
+        target = os.path.join(subdir, "b.txt")
+        open(target, "w").close()
+        self.assertIn((target, "created"), next(batches))
+    
+    def test_stop_ends_iteration(self):
+        """stop() from another thread should end read_batches()."""
+        watcher = self._watcher()
+        threading.Timer(0.05, watcher.stop).start()
+        self.assertEqual(list(watcher.read_batches()), [])
+    
+    def test_factory_watch_uses_inotify(self):
+        """WatcherFactory.watch() should yield native events on Linux."""
+        factory = WatcherFactory(debounce_window=0)
+        factory._system = "Linux"
+        target = os.path.join(self.tmpdir, "c.txt")
+        
+        def write():
+            with open(target, "w") as f:
+                f.write("abc")
+        
+        threading.Timer(0.1, write).start()
+        with patch("subprocess.Popen") as popen:
+            events = factory.watch(self.tmpdir)
+            event = next(events)
+            events.close()
+        
+        popen.assert_not_called()
+        self.assertEqual((event.path, event.kind), (target, "created"))
+        self.assertEqual(event.size, 3)
+
+    def test_factory_awatch_uses_inotify(self):
+        """awatch() should serve native events through the event loop."""
+        factory = WatcherFactory(debounce_window=0)
+        factory._system = "Linux"
+        target = os.path.join(self.tmpdir, "d.txt")
+        
+        async def first_event():
+            events = factory.awatch(self.tmpdir)
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.1, lambda: open(target, "w").close())
+            try:
+                return await asyncio.wait_for(events.__anext__(), timeout=5)
+            finally:
+                await events.aclose()
+        
+        event = asyncio.run(first_event())
+        self.assertEqual((event.path, event.kind, event.size), (target, "created", 0))
+
 
 def run_tests():
     """Run all test suites."""
@@ -184,6 +412,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(DebouncerTests))
     suite.addTests(loader.loadTestsFromTestCase(WatcherFactoryTests))
     suite.addTests(loader.loadTestsFromTestCase(IntegrationTests))
+    suite.addTests(loader.loadTestsFromTestCase(InotifyWatcherTests))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)